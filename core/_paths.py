@@ -0,0 +1,30 @@
+"""Filesystem locations shared by several commands.
+
+Not a command itself: modules starting with '_' are skipped when commands
+are listed.
+"""
+from __future__ import annotations
+
+import os
+from functools import lru_cache
+from pathlib import Path
+
+
+@lru_cache(maxsize=1)
+def kill_log_path() -> Path:
+    """Location of the kill log written by `kill` and read by `killswitch`.
+
+    Priority:
+    1) WILX_KILL_LOG env var
+    2) project-local .wilx_kill_log (repo root)
+    3) fallback to home dir
+
+    Resolved on first use and cached for the rest of the process.
+    """
+    env = os.environ.get('WILX_KILL_LOG')
+    if env:
+        return Path(env).expanduser()
+    try:
+        return Path(__file__).resolve().parents[1] / '.wilx_kill_log'
+    except Exception:
+        return Path(os.path.expanduser('~')) / '.wilx_kill_log'
@@ -10,67 +10,254 @@ This module exposes `execute(args: list[str]) -> int`.
 
 from __future__ import annotations
 
+import io
+import mmap
+import os
+import stat
 import sys
-import argparse
 from typing import List
 
+from utils.helpers import IOV_MAX, advise_done, advise_sequential, parse_flags, writev_all
 
-def _cat_file(path: str) -> int:
+# size of the reusable copy buffer and of each sendfile() request
+_COPY_BUFSIZE = 1 << 20
+_SENDFILE_CHUNK = 0x7fffffff
+# regular files larger than this are memory-mapped when sendfile can't be used
+_MMAP_MIN_SIZE = 1 << 20
+# `cat -n` builds the whole numbered file in memory up to this size and
+# streams line by line above it
+_NUMBER_INMEMORY_MAX = 64 << 20
+# bound formatter for the `cat -n` line prefix, looked up once
+_NUM_HDR = b"%6d\t".__mod__
+
+# error message templates, bound once
+_ERR_NOENT = "cat: {}: No such file or directory".format
+_ERR_ISDIR = "cat: {}: Is a directory".format
+_ERR_ACCES = "cat: {}: Permission denied".format
+_ERR_OTHER = "cat: {}: {}".format
+
+
+def _error_message(path: str, exc: OSError) -> str:
+    if isinstance(exc, FileNotFoundError):
+        return _ERR_NOENT(path)
+    if isinstance(exc, IsADirectoryError):
+        return _ERR_ISDIR(path)
+    if isinstance(exc, PermissionError):
+        return _ERR_ACCES(path)
+    return _ERR_OTHER(path, exc)
+
+
+def _stdout_fd() -> int | None:
     try:
-        with open(path, 'rb') as f:
-            # read and write in binary to faithfully pass bytes to stdout
+        return sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def _write_mmapped(f) -> bool:
+    """Write the rest of a large regular file `f` to stdout through mmap.
+
+    Returns False (nothing written) for small, non-regular or unmappable
+    files.
+    """
+    try:
+        fd = f.fileno()
+        st = os.fstat(fd)
+        pos = f.tell()
+    except (AttributeError, OSError, ValueError):
+        return False
+    if not (stat.S_ISREG(st.st_mode) and st.st_size - pos > _MMAP_MIN_SIZE):
+        return False
+    try:
+        mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return False
+    with mm:
+        if hasattr(mm, 'madvise'):
+            # let the kernel read ahead aggressively
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        with memoryview(mm)[pos:] as view:
+            sys.stdout.buffer.write(view)
+    return True
+
+
+def _copy_to_stdout(f) -> None:
+    """Copy the binary file object `f` to stdout.
+
+    Uses os.sendfile (in-kernel copy) when both ends are real file
+    descriptors. Otherwise large regular files are memory-mapped and written
+    in one call, and anything else streams through a single preallocated
+    buffer so no new bytes object is created per chunk.
+    """
+    sendfile = getattr(os, 'sendfile', None)
+    if sendfile is not None:
+        out_fd = _stdout_fd()
+        try:
+            in_fd = f.fileno()
+        except (AttributeError, OSError, ValueError):
+            out_fd = None
+        if out_fd is not None:
+            # anything already buffered must reach the fd before we bypass it
+            sys.stdout.flush()
+            try:
+                # offset=None reads from (and advances) the current position,
+                # so the fallback below resumes where sendfile stopped
+                while sendfile(out_fd, in_fd, None, _SENDFILE_CHUNK):
+                    pass
+                return
+            except OSError:
+                pass
+
+    if _write_mmapped(f):
+        return
+
+    buf = bytearray(_COPY_BUFSIZE)
+    view = memoryview(buf)
+    readinto = f.readinto
+    write = sys.stdout.buffer.write
+    while True:
+        n = readinto(buf)
+        if not n:
+            break
+        write(view[:n])
+
+
+def _prefetch(path: str) -> None:
+    """Ask the kernel to start reading `path` into the page cache.
+
+    Best effort: lets the next file's disk reads overlap with copying the
+    current one when several files are given.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _interleave(lines: List[bytes], line_no: int) -> List[bytes]:
+    """Return `lines` with a number prefix before each one."""
+    n = len(lines)
+    # slice assignment and map() run from C, so no bytecode executes per line
+    parts = [b""] * (2 * n)
+    parts[::2] = map(_NUM_HDR, range(line_no, line_no + n))
+    parts[1::2] = lines
+    return parts
+
+
+def _number_lines(f, line_no: int) -> int:
+    """Write binary file `f` to stdout with numbered lines.
+
+    Returns the next line number so numbering continues across files.
+    """
+    write = sys.stdout.buffer.write
+    try:
+        size = os.fstat(f.fileno()).st_size
+    except (AttributeError, OSError, ValueError):
+        size = _NUMBER_INMEMORY_MAX + 1
+    if size > _NUMBER_INMEMORY_MAX:
+        hdr = _NUM_HDR
+        out_fd = _stdout_fd()
+        if out_fd is None or not hasattr(os, 'writev'):
+            # read about a buffer's worth of lines at a time and let
+            # writelines() do the per-line loop
+            readlines = f.readlines
+            writelines = sys.stdout.buffer.writelines
             while True:
-                chunk = f.read(8192)
-                if not chunk:
+                lines = readlines(_COPY_BUFSIZE)
+                if not lines:
                     break
-                sys.stdout.buffer.write(chunk)
+                writelines(_interleave(lines, line_no))
+                line_no += len(lines)
+            return line_no
+
+        # gather prefix/line pairs and hand them to the kernel unjoined,
+        # one writev() per IOV_MAX buffers
+        sys.stdout.flush()
+        iov: List[bytes] = []
+        append = iov.append
+        for line in f:
+            append(hdr(line_no))
+            append(line)
+            line_no += 1
+            if len(iov) >= IOV_MAX:
+                writev_all(out_fd, iov)
+                iov.clear()
+        if iov:
+            writev_all(out_fd, iov)
+        return line_no
+
+    # split on b'\n' only, like the streaming branch; splitlines() would
+    # also break on a bare '\r' and number it as a line of its own
+    lines = io.BytesIO(f.read()).readlines()
+    write(b"".join(_interleave(lines, line_no)))
+    return line_no + len(lines)
+
+
+def _cat_file(path: str) -> int:
+    try:
+        with open(path, 'rb') as f:
+            fd = f.fileno()
+            advise_sequential(fd)
+            # binary copy to faithfully pass bytes to stdout
+            _copy_to_stdout(f)
+            advise_done(fd)
         return 0
-    except FileNotFoundError:
-        print(f"cat: {path}: No such file or directory", file=sys.stderr)
-        return 1
-    except IsADirectoryError:
-        print(f"cat: {path}: Is a directory", file=sys.stderr)
-        return 1
-    except PermissionError:
-        print(f"cat: {path}: Permission denied", file=sys.stderr)
+    except OSError as e:
+        print(_error_message(path, e), file=sys.stderr)
         return 1
 
 
-def execute(args: List[str]) -> int:
+_FLAGS = {'-n': 'number', '--number': 'number', '-h': 'show_help', '--help': 'show_help'}
+
+
+def _parser():
+    import argparse
+
     parser = argparse.ArgumentParser(prog='cat', add_help=False)
     parser.add_argument('-n', '--number', action='store_true', help='number all output lines')
     parser.add_argument('paths', nargs='*', help='files to read')
     parser.add_argument('-h', '--help', action='store_true', dest='show_help')
+    return parser
 
-    ns = parser.parse_args(args)
+
+def execute(args: List[str]) -> int:
+    ns = parse_flags(args, _FLAGS, 'paths', _parser)
     if ns.show_help:
-        parser.print_help()
+        _parser().print_help()
         return 0
 
     # if no files given, read from stdin
     if not ns.paths:
         # stream stdin in chunks to avoid loading everything into memory
-        while True:
-            chunk = sys.stdin.buffer.read(8192)
-            if not chunk:
-                break
-            sys.stdout.buffer.write(chunk)
+        _copy_to_stdout(sys.stdin.buffer)
         return 0
 
     exit_code = 0
     line_no = 1
-    for p in ns.paths:
-        # plain cat behavior: dump files sequentially
+    paths = ns.paths
+    prefetch = len(paths) > 1 and hasattr(os, 'posix_fadvise')
+    for i, p in enumerate(paths):
+        if prefetch and i + 1 < len(paths):
+            _prefetch(paths[i + 1])
+        if not ns.number:
+            # plain cat behavior: dump files sequentially
+            if _cat_file(p):
+                exit_code = 1
+            continue
         try:
-            with open(p, 'r', encoding='utf-8', errors='replace') as f:
-                for line in f:
-                    if ns.number:
-                        sys.stdout.write(f"{line_no:6d}	{line}")
-                        line_no += 1
-                    else:
-                        sys.stdout.write(line)
-        except Exception as e:
-            print(f"cat: {p}: {e}", file=sys.stderr)
+            with open(p, 'rb') as f:
+                fd = f.fileno()
+                advise_sequential(fd)
+                line_no = _number_lines(f, line_no)
+                advise_done(fd)
+        except OSError as e:
+            print(_error_message(p, e), file=sys.stderr)
             exit_code = 1
 
     return exit_code
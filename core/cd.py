@@ -10,6 +10,15 @@ import os
 import sys
 from typing import List
 
+# resolved once; `cd` with no argument is the common case in the shell
+_HOME = os.path.expanduser('~')
+
+# error message templates, bound once
+_ERR_NOENT = "cd: {}: No such file or directory".format
+_ERR_NOTDIR = "cd: {}: Not a directory".format
+_ERR_ACCES = "cd: {}: Permission denied".format
+_ERR_OTHER = "cd: {}".format
+
 
 def execute(args: List[str]) -> int:
     # Simplified argument parsing for simple command
@@ -18,20 +27,20 @@ def execute(args: List[str]) -> int:
         print('Change the current directory to PATH (defaults to home directory).')
         return 0
 
-    target = args[0] if args else os.path.expanduser('~')
+    target = args[0] if args else _HOME
     try:
         os.chdir(target)
     except FileNotFoundError:
-        print(f"cd: {target}: No such file or directory", file=sys.stderr)
+        print(_ERR_NOENT(target), file=sys.stderr)
         return 1
     except NotADirectoryError:
-        print(f"cd: {target}: Not a directory", file=sys.stderr)
+        print(_ERR_NOTDIR(target), file=sys.stderr)
         return 1
     except PermissionError:
-        print(f"cd: {target}: Permission denied", file=sys.stderr)
+        print(_ERR_ACCES(target), file=sys.stderr)
         return 1
     except Exception as e:
-        print(f"cd: {e}", file=sys.stderr)
+        print(_ERR_OTHER(e), file=sys.stderr)
         return 1
 
     return 0
@@ -37,6 +37,47 @@ else:
     win32clipboard = None
     ctypes = None
 
+# CF_UNICODETEXT clipboard format and GlobalAlloc flag
+CF_UNICODETEXT = 13
+GMEM_MOVEABLE = 0x0002
+
+if os.name == 'nt' and win32clipboard is None and ctypes is not None:
+    # Resolve the ctypes fallback's functions once and declare their
+    # prototypes. Private WinDLL instances keep these argtypes from leaking
+    # into other modules' use of ctypes.windll, and the HANDLE/LPVOID
+    # restypes keep 64-bit handles from being truncated to int.
+    _user32 = ctypes.WinDLL('user32', use_last_error=True)
+    _kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+
+    _OpenClipboard = _user32.OpenClipboard
+    _OpenClipboard.argtypes = [wintypes.HWND]
+    _OpenClipboard.restype = wintypes.BOOL
+    _EmptyClipboard = _user32.EmptyClipboard
+    _EmptyClipboard.argtypes = []
+    _EmptyClipboard.restype = wintypes.BOOL
+    _CloseClipboard = _user32.CloseClipboard
+    _CloseClipboard.argtypes = []
+    _CloseClipboard.restype = wintypes.BOOL
+    _GetClipboardData = _user32.GetClipboardData
+    _GetClipboardData.argtypes = [wintypes.UINT]
+    _GetClipboardData.restype = wintypes.HANDLE
+    _SetClipboardData = _user32.SetClipboardData
+    _SetClipboardData.argtypes = [wintypes.UINT, wintypes.HANDLE]
+    _SetClipboardData.restype = wintypes.HANDLE
+
+    _GlobalAlloc = _kernel32.GlobalAlloc
+    _GlobalAlloc.argtypes = [wintypes.UINT, ctypes.c_size_t]
+    _GlobalAlloc.restype = wintypes.HGLOBAL
+    _GlobalLock = _kernel32.GlobalLock
+    _GlobalLock.argtypes = [wintypes.HGLOBAL]
+    _GlobalLock.restype = wintypes.LPVOID
+    _GlobalUnlock = _kernel32.GlobalUnlock
+    _GlobalUnlock.argtypes = [wintypes.HGLOBAL]
+    _GlobalUnlock.restype = wintypes.BOOL
+    _GlobalSize = _kernel32.GlobalSize
+    _GlobalSize.argtypes = [wintypes.HGLOBAL]
+    _GlobalSize.restype = ctypes.c_size_t
+
 
 def _copy_to_clipboard(text: str) -> bool:
     """Copy text to Windows clipboard. Returns True on success."""
@@ -56,28 +97,24 @@ def _copy_to_clipboard(text: str) -> bool:
     elif ctypes:
         # Pure Python fallback using ctypes
         try:
-            user32 = ctypes.windll.user32
-            kernel32 = ctypes.windll.kernel32
-
-            # CF_UNICODETEXT = 13
-            CF_UNICODETEXT = 13
-
-            user32.OpenClipboard(None)
-            user32.EmptyClipboard()
-
-            # Allocate and copy text
-            text_bytes = text.encode('utf-16le')
-            hmem = kernel32.GlobalAlloc(0x2000, len(text_bytes) + 2)  # GMEM_MOVEABLE
-            mem = kernel32.GlobalLock(hmem)
-            ctypes.memmove(mem, text_bytes, len(text_bytes))
-            kernel32.GlobalUnlock(hmem)
-
-            user32.SetClipboardData(CF_UNICODETEXT, hmem)
-            user32.CloseClipboard()
+            _OpenClipboard(None)
+            _EmptyClipboard()
+
+            # Allocate and copy text: the unicode buffer already holds the
+            # NUL-terminated UTF-16 data, so this is one allocation and one copy
+            buf = ctypes.create_unicode_buffer(text)
+            n_bytes = ctypes.sizeof(buf)
+            hmem = _GlobalAlloc(GMEM_MOVEABLE, n_bytes)
+            mem = _GlobalLock(hmem)
+            ctypes.memmove(mem, buf, n_bytes)
+            _GlobalUnlock(hmem)
+
+            _SetClipboardData(CF_UNICODETEXT, hmem)
+            _CloseClipboard()
             return True
         except Exception:
             try:
-                user32.CloseClipboard()
+                _CloseClipboard()
             except Exception:
                 pass
             return False
@@ -106,35 +143,29 @@ def _get_clipboard_text() -> str | None:
     elif ctypes:
         # Pure Python fallback using ctypes
         try:
-            user32 = ctypes.windll.user32
-            kernel32 = ctypes.windll.kernel32
-
-            CF_UNICODETEXT = 13
-
-            user32.OpenClipboard(None)
-            hmem = user32.GetClipboardData(CF_UNICODETEXT)
+            _OpenClipboard(None)
+            hmem = _GetClipboardData(CF_UNICODETEXT)
             if not hmem:
-                user32.CloseClipboard()
+                _CloseClipboard()
                 return None
 
-            mem = kernel32.GlobalLock(hmem)
+            mem = _GlobalLock(hmem)
             if not mem:
-                user32.CloseClipboard()
+                _CloseClipboard()
                 return None
 
-            # Get size first
-            size = kernel32.GlobalSize(hmem)
-            buffer = ctypes.create_unicode_buffer(size // 2)
-            ctypes.memmove(buffer, mem, size)
-            kernel32.GlobalUnlock(hmem)
-            user32.CloseClipboard()
+            # Read straight from the locked memory (bounded by its size)
+            size = _GlobalSize(hmem)
+            text = ctypes.wstring_at(mem, size // 2)
+            _GlobalUnlock(hmem)
+            _CloseClipboard()
 
-            # Remove null terminator
-            text = buffer.value.rstrip('\x00')
-            return text
+            # Cut at the null terminator
+            nul = text.find('\x00')
+            return text if nul < 0 else text[:nul]
         except Exception:
             try:
-                user32.CloseClipboard()
+                _CloseClipboard()
             except Exception:
                 pass
             return None
@@ -159,14 +190,13 @@ def _clear_clipboard() -> bool:
             return False
     elif ctypes:
         try:
-            user32 = ctypes.windll.user32
-            user32.OpenClipboard(None)
-            user32.EmptyClipboard()
-            user32.CloseClipboard()
+            _OpenClipboard(None)
+            _EmptyClipboard()
+            _CloseClipboard()
             return True
         except Exception:
             try:
-                user32.CloseClipboard()
+                _CloseClipboard()
             except Exception:
                 pass
             return False
@@ -6,22 +6,200 @@ Usage: cp [-r] SOURCE... DEST
 from __future__ import annotations
 
 import shutil
-import argparse
+import stat
 import sys
 import os
 from typing import List
 
+from utils.helpers import advise_done, advise_sequential, parse_flags
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# ioctl request number for a copy-on-write clone (Btrfs/XFS/...)
+_FICLONE = 0x40049409
+# size of each sendfile() request and of the userspace fallback buffer
+_SENDFILE_CHUNK = 1 << 30
+_COPY_BUFSIZE = 1 << 20
+
+# error message templates, bound once
+_ERR_NOTDIR = "cp: target '{}' is not a directory".format
+_ERR_OMIT_DIR = "cp: -r not specified; omitting directory '{}'".format
+_ERR_OTHER = "cp: {}".format
+
+
+def _same_file(src_st: os.stat_result, dst: str) -> bool:
+    try:
+        dst_st = os.stat(dst)
+    except OSError:
+        return False
+    return (src_st.st_dev, src_st.st_ino) == (dst_st.st_dev, dst_st.st_ino)
+
+
+def _try_reflink(src_fd: int, dst_fd: int) -> bool:
+    """Clone `src_fd` into `dst_fd` with the FICLONE ioctl.
+
+    Returns False when the platform or filesystem cannot clone.
+    """
+    if fcntl is None:
+        return False
+    try:
+        fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+        return True
+    except OSError:
+        return False
+
+
+def _sendfile_copy(src_fd: int, dst_fd: int) -> bool:
+    """Copy `src_fd` into `dst_fd` in-kernel with os.sendfile.
+
+    Returns False if sendfile is unavailable or rejects the fds before any
+    data was copied; errors after a partial copy are raised.
+    """
+    sendfile = getattr(os, 'sendfile', None)
+    if sendfile is None:
+        return False
+    offset = 0
+    try:
+        while True:
+            sent = sendfile(dst_fd, src_fd, offset, _SENDFILE_CHUNK)
+            if not sent:
+                break
+            offset += sent
+    except OSError:
+        if offset:
+            raise
+        return False
+    return True
+
+
+def _fast_copy(src: str, dst: str, st: os.stat_result | None = None) -> str:
+    """Copy file `src` to the path `dst` preserving metadata (like copy2).
+
+    Tries a copy-on-write clone, then an in-kernel sendfile copy, then a
+    copyfileobj loop over a 1 MiB buffer. `st` may carry an already known
+    os.stat(src).
+    """
+    if st is None:
+        st = os.stat(src)
+    if not stat.S_ISREG(st.st_mode):
+        # fifos, devices, ...: let shutil decide how to handle them
+        return shutil.copy2(src, dst)
+    if _same_file(st, dst):
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        # a clone never reads the data, so only hint the kernel when copying
+        if not _try_reflink(src_fd, dst_fd):
+            advise_sequential(src_fd)
+            if not _sendfile_copy(src_fd, dst_fd):
+                shutil.copyfileobj(fsrc, fdst, _COPY_BUFSIZE)
+            advise_done(src_fd, st.st_size)
+    shutil.copystat(src, dst)
+    return dst
+
+
+def _copytree(src: str, dst: str) -> str:
+    """Recursively copy directory `src` to `dst`, which must not exist.
+
+    Behaves like shutil.copytree but walks with os.scandir, whose entries
+    carry the file type from readdir, and copies files with _fast_copy.
+    Per-entry errors are collected and raised together as shutil.Error.
+    """
+    os.makedirs(dst)
+    errors = []
+    with os.scandir(src) as it:
+        entries = list(it)
+    for entry in entries:
+        target = os.path.join(dst, entry.name)
+        try:
+            if entry.is_dir():
+                _copytree(entry.path, target)
+            else:
+                _fast_copy(entry.path, target, entry.stat())
+        except shutil.Error as err:
+            errors.extend(err.args[0])
+        except OSError as err:
+            errors.append((entry.path, target, str(err)))
+    try:
+        shutil.copystat(src, dst)
+    except OSError as err:
+        errors.append((src, dst, str(err)))
+    if errors:
+        raise shutil.Error(errors)
+    return dst
+
+
+def _stat_or_none(path: str) -> os.stat_result | None:
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def _run_copies(jobs: List[tuple], errors: List[str]) -> int:
+    """Run `(copy_func, *args)` jobs and return 1 if any of them failed.
+
+    Failure messages are appended to `errors`. Several jobs run on a small
+    thread pool: copying is I/O-bound and the GIL is released inside the
+    copy syscalls, so independent sources overlap instead of queueing
+    behind each other.
+    """
+    if len(jobs) == 1:
+        func, *fargs = jobs[0]
+        try:
+            func(*fargs)
+        except Exception as e:
+            errors.append(_ERR_OTHER(e))
+            return 1
+        return 0
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    rc = 0
+    workers = min(8, os.cpu_count() or 1, len(jobs))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(*job) for job in jobs]
+        for fut in futures:
+            try:
+                fut.result()
+            except Exception as e:
+                errors.append(_ERR_OTHER(e))
+                rc = 1
+    return rc
+
+
+def _write_lines(stream, lines: List[str]) -> None:
+    # one write per stream instead of a print() per line
+    if lines:
+        stream.write('\n'.join(lines) + '\n')
+
+
+_FLAGS = {
+    '-r': 'recursive', '--recursive': 'recursive',
+    '--dry-run': 'dry_run',
+    '-h': 'show_help', '--help': 'show_help',
+}
+
+
+def _parser():
+    import argparse
 
-def execute(args: List[str]) -> int:
     parser = argparse.ArgumentParser(prog='cp', add_help=False)
     parser.add_argument('-r', '--recursive', action='store_true', help='copy directories recursively')
     parser.add_argument('--dry-run', action='store_true', help="show what would be done, but don't actually copy files")
     parser.add_argument('paths', nargs='+')
     parser.add_argument('-h', '--help', action='store_true', dest='show_help')
+    return parser
+
 
-    ns = parser.parse_args(args)
+def execute(args: List[str]) -> int:
+    ns = parse_flags(args, _FLAGS, 'paths', _parser)
     if ns.show_help:
-        parser.print_help()
+        _parser().print_help()
         return 0
 
     paths = ns.paths
@@ -32,54 +210,67 @@ def execute(args: List[str]) -> int:
     *sources, dest = paths
 
     try:
+        # one stat per operand: the result decides file vs dir and is
+        # reused by the copy itself
+        dest_st = _stat_or_none(dest)
+        dest_is_dir = dest_st is not None and stat.S_ISDIR(dest_st.st_mode)
         if len(sources) > 1:
-            if not os.path.isdir(dest):
-                print(f"cp: target '{dest}' is not a directory", file=sys.stderr)
+            if not dest_is_dir:
+                print(_ERR_NOTDIR(dest), file=sys.stderr)
                 return 1
+            jobs = []
+            actions: List[str] = []
+            errors: List[str] = []
             for s in sources:
-                if os.path.isdir(s):
+                st = _stat_or_none(s)
+                target = os.path.join(dest, os.path.basename(s))
+                if st is not None and stat.S_ISDIR(st.st_mode):
                     if ns.recursive:
-                        action = f"copytree '{s}' -> '{os.path.join(dest, os.path.basename(s))}'"
                         if ns.dry_run:
-                            print(action)
+                            actions.append(f"copytree '{s}' -> '{target}'")
                         else:
-                            shutil.copytree(s, os.path.join(dest, os.path.basename(s)))
+                            jobs.append((_copytree, s, target))
                     else:
-                        print(f"cp: -r not specified; omitting directory '{s}'", file=sys.stderr)
+                        errors.append(_ERR_OMIT_DIR(s))
                 else:
-                    action = f"copy '{s}' -> '{dest}'"
                     if ns.dry_run:
-                        print(action)
+                        actions.append(f"copy '{s}' -> '{dest}'")
                     else:
-                        shutil.copy2(s, dest)
+                        jobs.append((_fast_copy, s, target, st))
+            rc = _run_copies(jobs, errors) if jobs else 0
+            _write_lines(sys.stdout, actions)
+            _write_lines(sys.stderr, errors)
+            return rc
         else:
             s = sources[0]
-            if os.path.isdir(s):
+            st = _stat_or_none(s)
+            if st is not None and stat.S_ISDIR(st.st_mode):
                 if ns.recursive:
                     action = f"copytree '{s}' -> '{dest}'"
                     if ns.dry_run:
                         print(action)
                     else:
-                        shutil.copytree(s, dest)
+                        _copytree(s, dest)
                 else:
-                    print(f"cp: -r not specified; omitting directory '{s}'", file=sys.stderr)
+                    print(_ERR_OMIT_DIR(s), file=sys.stderr)
                     return 1
             else:
                 # dest may be a dir
-                if os.path.isdir(dest):
-                    action = f"copy '{s}' -> '{os.path.join(dest, os.path.basename(s))}'"
+                if dest_is_dir:
+                    target = os.path.join(dest, os.path.basename(s))
+                    action = f"copy '{s}' -> '{target}'"
                     if ns.dry_run:
                         print(action)
                     else:
-                        shutil.copy2(s, os.path.join(dest, os.path.basename(s)))
+                        _fast_copy(s, target, st)
                 else:
                     action = f"copy '{s}' -> '{dest}'"
                     if ns.dry_run:
                         print(action)
                     else:
-                        shutil.copy2(s, dest)
+                        _fast_copy(s, dest, st)
     except Exception as e:
-        print(f"cp: {e}", file=sys.stderr)
+        print(_ERR_OTHER(e), file=sys.stderr)
         return 1
 
     return 0
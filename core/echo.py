@@ -5,25 +5,72 @@ Supports -n to omit trailing newline.
 
 from __future__ import annotations
 
-import argparse
+import os
 import sys
 from typing import List
 
+from utils.helpers import writev_all
+
+# text-mode stdout translates '\n' to the platform line ending
+_NEWLINE = os.linesep.encode('ascii')
+_SP = b' '
+
+
+def _parser():
+    # only built for --help; normal invocations are parsed by hand
+    import argparse
 
-def execute(args: List[str]) -> int:
     parser = argparse.ArgumentParser(prog='echo', add_help=False)
     parser.add_argument('-n', action='store_true', help='do not print the trailing newline')
     parser.add_argument('text', nargs='*')
     parser.add_argument('-h', '--help', action='store_true', dest='show_help')
+    return parser
+
+
+def execute(args: List[str]) -> int:
+    if args and args[0] in ('-h', '--help'):
+        _parser().print_help()
+        return 0
+
+    # like GNU echo, only leading -n options are recognised
+    newline = True
+    while args and args[0] == '-n':
+        newline = False
+        args = args[1:]
+
+    stream = sys.stdout
+    buf = getattr(stream, 'buffer', None)
+    if buf is None:
+        # e.g. a StringIO installed while capturing output
+        out = ' '.join(args)
+        stream.write(out + '\n' if newline else out)
+        return 0
 
-    ns = parser.parse_args(args)
-    if ns.show_help:
-        parser.print_help()
+    # bypass the text layer; flush it first so earlier output stays in order
+    stream.flush()
+    encoding = stream.encoding or 'utf-8'
+    try:
+        fd = buf.fileno()
+    except (AttributeError, OSError, ValueError):
+        fd = None
+    if fd is None or not hasattr(os, 'writev'):
+        write = buf.write
+        write(' '.join(args).encode(encoding, 'surrogateescape'))
+        if newline:
+            write(_NEWLINE)
+        if stream.line_buffering:
+            buf.flush()
         return 0
 
-    out = ' '.join(ns.text)
-    if ns.n:
-        sys.stdout.write(out)
-    else:
-        print(out)
+    # hand the arguments and separators to the kernel unjoined
+    iov: List[bytes] = []
+    append = iov.append
+    for i, arg in enumerate(args):
+        if i:
+            append(_SP)
+        append(arg.encode(encoding, 'surrogateescape'))
+    if newline:
+        append(_NEWLINE)
+    if iov:
+        writev_all(fd, iov)
     return 0
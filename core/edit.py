@@ -4,14 +4,16 @@ from __future__ import annotations
 import sys
 from typing import List
 
+# Resolve core.nano once at import instead of on every call
+try:
+    from . import nano as _nano
+except ImportError:
+    import nano as _nano
+
 
 def execute(argv: List[str]) -> int:
     # Delegate to core.nano
-    try:
-        from . import nano
-    except Exception:
-        import nano
-    return nano.execute(argv)
+    return _nano.execute(argv)
 
 
 if __name__ == '__main__':
@@ -1,28 +1,343 @@
 """Formatted lightweight `htop`-like viewer for Wilx.
 
 This version keeps startup fast (no heavy imports) while presenting the
-process snapshot in a boxed, aligned layout for readability. It uses
-platform-native commands (tasklist/WMIC on Windows, ps/free on Unix) and
-optionally queries `nvidia-smi` for GPU details if available.
+process snapshot in a boxed, aligned layout for readability. It reads
+native sources (Win32/NT APIs on Windows, /proc on Linux), falling back to
+tasklist/WMIC or ps/free, and optionally queries `nvidia-smi` for GPU
+details if available.
 
 Usage:
   htop            # snapshot
-  htop --watch 2  # refresh every 2 seconds
+  htop --watch 2  # refresh every 2 seconds (q or Ctrl-C quits)
   htop -n 12      # show top 12 processes
 """
 
 from __future__ import annotations
 
+import heapq
 import os
 import sys
 import shutil
-import argparse
-import subprocess
 import time
+from operator import itemgetter
+from types import SimpleNamespace
 from typing import List, Tuple, Optional
-import csv
-import ctypes
-from ctypes import wintypes
+
+# subprocess and argparse are imported where they are needed:
+# the common Linux path reads /proc and never spawns anything, and ctypes
+# is only loaded on Windows
+
+if os.name == 'nt':
+    import ctypes
+    from ctypes import wintypes
+
+    # Memory and CPU load come straight from the Win32/NT APIs instead of
+    # spawning WMIC (COM startup alone costs hundreds of ms per snapshot).
+    # Private WinDLL instances keep these prototypes local to this module.
+    _kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    _ntdll = ctypes.WinDLL('ntdll')
+
+    class _MEMORYSTATUSEX(ctypes.Structure):
+        _fields_ = [
+            ('dwLength', wintypes.DWORD),
+            ('dwMemoryLoad', wintypes.DWORD),
+            ('ullTotalPhys', ctypes.c_ulonglong),
+            ('ullAvailPhys', ctypes.c_ulonglong),
+            ('ullTotalPageFile', ctypes.c_ulonglong),
+            ('ullAvailPageFile', ctypes.c_ulonglong),
+            ('ullTotalVirtual', ctypes.c_ulonglong),
+            ('ullAvailVirtual', ctypes.c_ulonglong),
+            ('ullAvailExtendedVirtual', ctypes.c_ulonglong),
+        ]
+
+    class _SYSTEM_PROCESSOR_PERFORMANCE_INFORMATION(ctypes.Structure):
+        _fields_ = [
+            ('IdleTime', wintypes.LARGE_INTEGER),
+            ('KernelTime', wintypes.LARGE_INTEGER),
+            ('UserTime', wintypes.LARGE_INTEGER),
+            ('DpcTime', wintypes.LARGE_INTEGER),
+            ('InterruptTime', wintypes.LARGE_INTEGER),
+            ('InterruptCount', wintypes.ULONG),
+        ]
+
+    _GlobalMemoryStatusEx = _kernel32.GlobalMemoryStatusEx
+    _GlobalMemoryStatusEx.argtypes = [ctypes.POINTER(_MEMORYSTATUSEX)]
+    _GlobalMemoryStatusEx.restype = wintypes.BOOL
+    _NtQuerySystemInformation = _ntdll.NtQuerySystemInformation
+    _NtQuerySystemInformation.argtypes = [wintypes.ULONG, ctypes.c_void_p, wintypes.ULONG, ctypes.POINTER(wintypes.ULONG)]
+    _NtQuerySystemInformation.restype = wintypes.LONG
+
+    class _UNICODE_STRING(ctypes.Structure):
+        _fields_ = [
+            ('Length', wintypes.USHORT),
+            ('MaximumLength', wintypes.USHORT),
+            ('Buffer', ctypes.c_void_p),
+        ]
+
+    class _SYSTEM_PROCESS_INFORMATION(ctypes.Structure):
+        # leading part of the record; only fields up to WorkingSetSize are read
+        _fields_ = [
+            ('NextEntryOffset', wintypes.ULONG),
+            ('NumberOfThreads', wintypes.ULONG),
+            ('WorkingSetPrivateSize', wintypes.LARGE_INTEGER),
+            ('HardFaultCount', wintypes.ULONG),
+            ('NumberOfThreadsHighWatermark', wintypes.ULONG),
+            ('CycleTime', ctypes.c_ulonglong),
+            ('CreateTime', wintypes.LARGE_INTEGER),
+            ('UserTime', wintypes.LARGE_INTEGER),
+            ('KernelTime', wintypes.LARGE_INTEGER),
+            ('ImageName', _UNICODE_STRING),
+            ('BasePriority', wintypes.LONG),
+            ('UniqueProcessId', ctypes.c_void_p),
+            ('InheritedFromUniqueProcessId', ctypes.c_void_p),
+            ('HandleCount', wintypes.ULONG),
+            ('SessionId', wintypes.ULONG),
+            ('UniqueProcessKey', ctypes.c_size_t),
+            ('PeakVirtualSize', ctypes.c_size_t),
+            ('VirtualSize', ctypes.c_size_t),
+            ('PageFaultCount', wintypes.ULONG),
+            ('PeakWorkingSetSize', ctypes.c_size_t),
+            ('WorkingSetSize', ctypes.c_size_t),
+        ]
+
+    class _PROCESSENTRY32W(ctypes.Structure):
+        _fields_ = [
+            ('dwSize', wintypes.DWORD),
+            ('cntUsage', wintypes.DWORD),
+            ('th32ProcessID', wintypes.DWORD),
+            ('th32DefaultHeapID', ctypes.c_size_t),
+            ('th32ModuleID', wintypes.DWORD),
+            ('cntThreads', wintypes.DWORD),
+            ('th32ParentProcessID', wintypes.DWORD),
+            ('pcPriClassBase', wintypes.LONG),
+            ('dwFlags', wintypes.DWORD),
+            ('szExeFile', wintypes.WCHAR * 260),
+        ]
+
+    class _PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ('cb', wintypes.DWORD),
+            ('PageFaultCount', wintypes.DWORD),
+            ('PeakWorkingSetSize', ctypes.c_size_t),
+            ('WorkingSetSize', ctypes.c_size_t),
+            ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+            ('PagefileUsage', ctypes.c_size_t),
+            ('PeakPagefileUsage', ctypes.c_size_t),
+        ]
+
+    _CreateToolhelp32Snapshot = _kernel32.CreateToolhelp32Snapshot
+    _CreateToolhelp32Snapshot.argtypes = [wintypes.DWORD, wintypes.DWORD]
+    _CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+    _Process32FirstW = _kernel32.Process32FirstW
+    _Process32FirstW.argtypes = [wintypes.HANDLE, ctypes.POINTER(_PROCESSENTRY32W)]
+    _Process32FirstW.restype = wintypes.BOOL
+    _Process32NextW = _kernel32.Process32NextW
+    _Process32NextW.argtypes = [wintypes.HANDLE, ctypes.POINTER(_PROCESSENTRY32W)]
+    _Process32NextW.restype = wintypes.BOOL
+    _ProcessIdToSessionId = _kernel32.ProcessIdToSessionId
+    _ProcessIdToSessionId.argtypes = [wintypes.DWORD, ctypes.POINTER(wintypes.DWORD)]
+    _ProcessIdToSessionId.restype = wintypes.BOOL
+    _OpenProcess = _kernel32.OpenProcess
+    _OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+    _OpenProcess.restype = wintypes.HANDLE
+    _CloseHandle = _kernel32.CloseHandle
+    _CloseHandle.argtypes = [wintypes.HANDLE]
+    _CloseHandle.restype = wintypes.BOOL
+    # the kernel32 export (Windows 7+) avoids loading psapi.dll
+    _GetProcessMemoryInfo = _kernel32.K32GetProcessMemoryInfo
+    _GetProcessMemoryInfo.argtypes = [wintypes.HANDLE, ctypes.POINTER(_PROCESS_MEMORY_COUNTERS), wintypes.DWORD]
+    _GetProcessMemoryInfo.restype = wintypes.BOOL
+
+    _GetStdHandle = _kernel32.GetStdHandle
+    _GetStdHandle.argtypes = [wintypes.DWORD]
+    _GetStdHandle.restype = wintypes.HANDLE
+    _GetConsoleMode = _kernel32.GetConsoleMode
+    _GetConsoleMode.argtypes = [wintypes.HANDLE, ctypes.POINTER(wintypes.DWORD)]
+    _GetConsoleMode.restype = wintypes.BOOL
+    _SetConsoleMode = _kernel32.SetConsoleMode
+    _SetConsoleMode.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+    _SetConsoleMode.restype = wintypes.BOOL
+
+    # HANDLE(-1) as seen through the c_void_p restype
+    _INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
+# NtQuerySystemInformation classes: all processes, per-CPU times
+_SystemProcessInformation = 5
+_SystemProcessorPerformanceInformation = 8
+_STATUS_INFO_LENGTH_MISMATCH = -0x3FFFFFFC  # 0xC0000004 as NTSTATUS
+_TH32CS_SNAPPROCESS = 0x00000002
+# enough for GetProcessMemoryInfo, and granted for more processes than
+# PROCESS_QUERY_INFORMATION | PROCESS_VM_READ
+_PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+# System Idle Process and System can't be opened; skip the calls for them
+_KERNEL_PIDS = frozenset((0, 4))
+# htop holds no descriptors worth hiding from its helpers; skipping the
+# close_fds sweep lets subprocess use posix_spawn on Unix
+_SPAWN_KW = {} if os.name == 'nt' else {'close_fds': False}
+# cursor home + clear screen; redraws a --watch frame without spawning cls/clear
+_CLEAR = '\x1b[H\x1b[2J'
+_CLEAR_B = _CLEAR.encode('ascii')
+# --watch frame buffer reused across refreshes: the clear sequence stays at
+# the front and each snapshot is copied in after it, growing only when a
+# frame is larger than any before
+_FRAME = bytearray(_CLEAR_B) + bytearray(16384)
+_STD_OUTPUT_HANDLE = -11 & 0xFFFFFFFF
+_ENABLE_VIRTUAL_TERMINAL_PROCESSING = 0x0004
+# /proc/[pid]/stat reports RSS in pages
+try:
+    _PAGE_KB = os.sysconf('SC_PAGESIZE') // 1024
+except (AttributeError, ValueError, OSError):
+    _PAGE_KB = 4
+# gap between the two CPU samples of a one-off snapshot
+_CPU_SAMPLE_INTERVAL = 0.1
+# (idle, busy) totals from the previous snapshot; under --watch the load is
+# measured over the refresh interval instead of sleeping for a new sample
+_last_cpu_times: Optional[Tuple[int, int]] = None
+
+
+def _cpu_times_winapi() -> Tuple[int, int]:
+    """Return summed (idle, busy) times over all processors, in 100ns units."""
+    count = os.cpu_count() or 1
+    info = (_SYSTEM_PROCESSOR_PERFORMANCE_INFORMATION * count)()
+    ret = wintypes.ULONG(0)
+    status = _NtQuerySystemInformation(_SystemProcessorPerformanceInformation, info, ctypes.sizeof(info), ctypes.byref(ret))
+    if status < 0:
+        raise OSError(f'NtQuerySystemInformation failed: 0x{status & 0xFFFFFFFF:08X}')
+    idle = total = 0
+    # kernel time includes idle time
+    for cpu in info[:ret.value // ctypes.sizeof(_SYSTEM_PROCESSOR_PERFORMANCE_INFORMATION)]:
+        idle += cpu.IdleTime
+        total += cpu.KernelTime + cpu.UserTime
+    return idle, total - idle
+
+
+def _cpu_load_winapi() -> float:
+    global _last_cpu_times
+    prev = _last_cpu_times
+    if prev is None:
+        prev = _cpu_times_winapi()
+        time.sleep(_CPU_SAMPLE_INTERVAL)
+    cur = _last_cpu_times = _cpu_times_winapi()
+    idle = cur[0] - prev[0]
+    busy = cur[1] - prev[1]
+    return 100.0 * busy / (idle + busy) if idle + busy > 0 else 0.0
+
+
+def _procs_ntquery() -> List[Tuple[str, int, int, str, int]]:
+    """Every process with its working set from one NtQuerySystemInformation call.
+
+    Returns the same tuples as `_parse_tasklist_csv`.
+    """
+    size = 1 << 18
+    ret = wintypes.ULONG(0)
+    while True:
+        buf = ctypes.create_string_buffer(size)
+        status = _NtQuerySystemInformation(_SystemProcessInformation, buf, size, ctypes.byref(ret))
+        if status != _STATUS_INFO_LENGTH_MISMATCH:
+            break
+        # the process list can grow between calls; leave some headroom
+        size = max(size * 2, ret.value + (1 << 16))
+    if status < 0:
+        raise OSError(f'NtQuerySystemInformation failed: 0x{status & 0xFFFFFFFF:08X}')
+
+    procs = []
+    offset = 0
+    while True:
+        rec = _SYSTEM_PROCESS_INFORMATION.from_buffer(buf, offset)
+        pid = rec.UniqueProcessId or 0
+        if rec.ImageName.Buffer:
+            name = ctypes.wstring_at(rec.ImageName.Buffer, rec.ImageName.Length // 2)
+        else:
+            name = 'System Idle Process'
+        session = rec.SessionId
+        procs.append((name, pid, rec.WorkingSetSize >> 20, 'Services' if session == 0 else 'Console', session))
+        if not rec.NextEntryOffset:
+            break
+        offset += rec.NextEntryOffset
+    return procs
+
+
+def _procs_toolhelp() -> List[Tuple[str, int, int, str, int]]:
+    """Process list via Toolhelp32, one OpenProcess per PID for its memory."""
+    snap = _CreateToolhelp32Snapshot(_TH32CS_SNAPPROCESS, 0)
+    if not snap or snap == _INVALID_HANDLE_VALUE:
+        raise ctypes.WinError(ctypes.get_last_error())
+    procs = []
+    append = procs.append
+    # one entry/counters/session buffer reused for every process, with the
+    # foreign functions and byref() pointers bound once outside the loop
+    open_process = _OpenProcess
+    close_handle = _CloseHandle
+    get_memory_info = _GetProcessMemoryInfo
+    pid_to_session = _ProcessIdToSessionId
+    process_next = _Process32NextW
+    access = _PROCESS_QUERY_LIMITED_INFORMATION
+    kernel_pids = _KERNEL_PIDS
+    try:
+        entry = _PROCESSENTRY32W()
+        entry.dwSize = ctypes.sizeof(_PROCESSENTRY32W)
+        entry_ref = ctypes.byref(entry)
+        counters = _PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(_PROCESS_MEMORY_COUNTERS)
+        counters_ref = ctypes.byref(counters)
+        counters_size = counters.cb
+        session = wintypes.DWORD(0)
+        session_ref = ctypes.byref(session)
+        res = _Process32FirstW(snap, entry_ref)
+        while res:
+            pid = entry.th32ProcessID
+            if pid in kernel_pids:
+                append((entry.szExeFile, pid, 0, 'Services', 0))
+                res = process_next(snap, entry_ref)
+                continue
+            session_num = session.value if pid_to_session(pid, session_ref) else -1
+            mem_mb = 0
+            h = open_process(access, False, pid)
+            if h:
+                try:
+                    if get_memory_info(h, counters_ref, counters_size):
+                        mem_mb = counters.WorkingSetSize >> 20
+                finally:
+                    close_handle(h)
+            append((entry.szExeFile, pid, mem_mb, 'Services' if session_num == 0 else 'Console', session_num))
+            res = process_next(snap, entry_ref)
+    finally:
+        _CloseHandle(snap)
+    return procs
+
+
+def _snapshot_windows_winapi() -> List[Tuple[str, int, int, str, int]]:
+    """Native process list: NtQuerySystemInformation, else Toolhelp32."""
+    try:
+        return _procs_ntquery()
+    except Exception:
+        return _procs_toolhelp()
+
+
+def _enable_vt() -> None:
+    """Turn on ANSI escape handling for the Windows console, if possible."""
+    try:
+        h = _GetStdHandle(_STD_OUTPUT_HANDLE)
+        mode = wintypes.DWORD(0)
+        if _GetConsoleMode(h, ctypes.byref(mode)):
+            _SetConsoleMode(h, mode.value | _ENABLE_VIRTUAL_TERMINAL_PROCESSING)
+    except Exception:
+        pass
+
+
+def _memory_winapi() -> Tuple[int, int, float]:
+    """Return (used_mb, total_mb, percent) of physical memory."""
+    ms = _MEMORYSTATUSEX()
+    ms.dwLength = ctypes.sizeof(_MEMORYSTATUSEX)
+    if not _GlobalMemoryStatusEx(ctypes.byref(ms)):
+        raise ctypes.WinError(ctypes.get_last_error())
+    total = ms.ullTotalPhys
+    used = total - ms.ullAvailPhys
+    percent = round((used / total) * 100, 1) if total else 0
+    return used >> 20, total >> 20, percent
 
 
 def _bar(value: float, width: int = 30) -> str:
@@ -46,20 +361,25 @@ def _box(title: str, lines: List[str]) -> None:
 
 
 def _get_gpu_info() -> Optional[List[Tuple[str, int, int]]]:
+    """Return (index, util%, mem_mb) per GPU, or None without nvidia-smi."""
+    import subprocess
+
     try:
         out = subprocess.check_output([
             'nvidia-smi',
             '--query-gpu=index,utilization.gpu,memory.used',
             '--format=csv,noheader,nounits'
-        ], stderr=subprocess.DEVNULL)
-        text = out.decode(errors='ignore').strip()
+        ], stderr=subprocess.DEVNULL, **_SPAWN_KW)
+        # the numeric columns are converted straight from bytes; only the
+        # index is decoded
+        text = out.strip()
         if not text:
             return None
         rows = []
         for line in text.splitlines():
-            parts = [p.strip() for p in line.split(',')]
+            parts = [p.strip() for p in line.split(b',')]
             if len(parts) >= 3:
-                gid = parts[0]
+                gid = parts[0].decode(errors='ignore')
                 util = int(parts[1]) if parts[1].isdigit() else 0
                 mem = int(parts[2]) if parts[2].isdigit() else 0
                 rows.append((gid, util, mem))
@@ -68,28 +388,33 @@ def _get_gpu_info() -> Optional[List[Tuple[str, int, int]]]:
         return None
 
 
+# strips the unit and thousands separators from tasklist's Mem Usage column
+_DIGITS_ONLY = str.maketrans('', '', ' ,.\u00a0\u202fKB')
+
+
 def _parse_tasklist_csv(text: str) -> List[Tuple[str, int, int, str, int]]:
     """Parse tasklist CSV output and return tuples:
     (image_name, pid, mem_mb, session_name, session_num)
     """
     rows = []
-    reader = csv.reader(text.splitlines())
-    for r in reader:
+    for line in text.splitlines():
+        # tasklist quotes every field and never embeds '","', so a plain
+        # split handles its fixed schema without the csv module
+        if not line.startswith('"'):
+            continue
+        r = line.rstrip()[1:-1].split('","')
         # Expected columns: Image Name, PID, Session Name, Session#, Mem Usage
         if len(r) < 5:
             continue
-        name = r[0].strip('"')
+        name = r[0]
         try:
             pid = int(r[1])
         except Exception:
             pid = 0
-        session_name = r[2].strip('"') if len(r) > 2 else ''
-        try:
-            session_num = int(r[3].strip('"')) if len(r) > 3 and r[3].strip('"').isdigit() else -1
-        except Exception:
-            session_num = -1
-        mem_str = r[4].strip().replace('"', '')
-        mem_num = ''.join(ch for ch in mem_str if ch.isdigit())
+        session_name = r[2]
+        session_num = int(r[3]) if r[3].isdigit() else -1
+        # e.g. '12,345 K'; thousands separators vary by locale
+        mem_num = r[4].translate(_DIGITS_ONLY)
         try:
             mem_k = int(mem_num)
             mem_mb = mem_k // 1024
@@ -99,147 +424,393 @@ def _parse_tasklist_csv(text: str) -> List[Tuple[str, int, int, str, int]]:
     return rows
 
 
-def _snapshot_windows(top: int = 8) -> None:
+# one cmd.exe round trip for both WMIC fallback queries
+_WMIC_COMMAND = ('wmic path Win32_OperatingSystem get FreePhysicalMemory,TotalVisibleMemorySize /Value'
+                 ' & wmic cpu get loadpercentage /Value')
+
+
+def _decode_console(out: bytes) -> str:
+    """Decode console tool output: UTF-16LE when it carries a BOM, else the ANSI code page."""
+    if out[:2] == b'\xff\xfe':
+        # each chained command may start with its own BOM
+        return out.decode('utf-16-le', errors='ignore').replace('\ufeff', '')
+    try:
+        return out.decode('mbcs', errors='ignore')
+    except LookupError:
+        return out.decode(errors='ignore')
+
+
+def _wmic_values() -> dict:
+    """Run the WMIC fallback queries once; return their Key=Value pairs as a dict."""
+    import subprocess
+
+    try:
+        proc = subprocess.run(['cmd', '/c', _WMIC_COMMAND], capture_output=True)
+    except Exception:
+        return {}
+    # /Value output is fixed-case Key=Value lines, so a plain dict lookup
+    # replaces per-line strip/lower comparisons
+    return dict(ln.split('=', 1) for ln in _decode_console(proc.stdout).splitlines() if '=' in ln)
+
+
+def _wmic_cpu_line(values: dict) -> Optional[str]:
+    """CPU load line from WMIC values; fallback when the native query fails."""
+    load = values.get('LoadPercentage', '').strip()
+    return f'CPU Load: {load}%' if load else None
+
+
+def _wmic_memory(values: dict) -> Tuple[Optional[int], Optional[int], float]:
+    """(used_mb, total_mb, percent) from WMIC values; fallback for _memory_winapi."""
+    try:
+        total = int(values['TotalVisibleMemorySize'])
+        free = int(values['FreePhysicalMemory'])
+    except (KeyError, ValueError):
+        return None, None, 0
+    used_k = total - free
+    percent = round((used_k / total) * 100, 1) if total else 0
+    return used_k // 1024, total // 1024, percent
+
+
+_NO_PROCESSES = 'No process information available\n'
+
+
+def _format_table(rows: List[Tuple[int, str, str, int]], total_mb: Optional[int]) -> str:
+    """Render (pid, name, type, mem_mb) rows as the PID | NAME | TYPE | MEM(MB) | MEM% table."""
+    if not rows:
+        return _NO_PROCESSES
+    # transpose once into columns so widths, percentages and the formatting
+    # itself run as C-level map()/max() over each column
+    pids, names, types, mems = zip(*rows)
+    pid_strs = list(map(str, pids))
+    mem_strs = list(map(str, mems))
+    if total_mb:
+        mempcts = [round((m / total_mb) * 100, 1) for m in mems]
+    else:
+        mempcts = [0.0] * len(mems)
+
+    pid_w = max(3, max(map(len, pid_strs)))
+    name_w = max(4, min(40, max(map(len, names))))
+    type_w = max(4, max(map(len, types)))
+    mem_w = max(7, max(map(len, mem_strs)) + 3)
+    mempct_w = 6
+
+    # one template per table; the NAME precision truncates long names
+    fmt = f"{{:>{pid_w}}}  {{:<{name_w}.{name_w}}}  {{:<{type_w}}}  {{:>{mem_w}}}  {{:>{mempct_w}}}".format
+    hdr = fmt('PID', 'NAME', 'TYPE', 'MEM(MB)', 'MEM%')
+    lines = [hdr, '-' * len(hdr)]
+    lines.extend(map(fmt, pid_strs, names, types, mem_strs, mempcts))
+    lines.append('')
+    return '\n'.join(lines)
+
+
+def _snapshot_windows(top: int = 8) -> str:
+    # WMIC output, fetched at most once and only if a native query fails
+    wmic = None
+
     # CPU load
     cpu_line = '(cpu load not available)'
     try:
-        out = subprocess.check_output(['wmic', 'cpu', 'get', 'loadpercentage', '/Value'], stderr=subprocess.DEVNULL)
-        txt = out.decode(errors='ignore')
-        for ln in txt.splitlines():
-            if '=' in ln:
-                k, v = ln.split('=', 1)
-                if k.strip().lower() == 'loadpercentage':
-                    cpu_line = f'CPU Load: {v.strip()}%'
-                    break
+        cpu_line = f'CPU Load: {_cpu_load_winapi():.0f}%'
     except Exception:
-        pass
+        wmic = _wmic_values()
+        cpu_line = _wmic_cpu_line(wmic) or cpu_line
 
     # Memory - calculate total_mb once for reuse
     mem_line = '(memory info not available)'
     total_mb = None
     try:
-        out = subprocess.check_output(['wmic', 'OS', 'get', 'FreePhysicalMemory,TotalVisibleMemorySize', '/Value'], stderr=subprocess.DEVNULL)
-        txt = out.decode(errors='ignore')
-        total = free = None
-        for ln in txt.splitlines():
-            if '=' in ln:
-                k, v = ln.split('=', 1)
-                if k.strip().lower() == 'totalvisiblememorysize':
-                    total = int(v.strip())
-                if k.strip().lower() == 'freephysicalmemory':
-                    free = int(v.strip())
-        if total is not None and free is not None:
-            used_k = total - free
-            used_mb = used_k // 1024
-            total_mb = total // 1024  # Store for reuse in process percentage calculation
-            percent = round((used_k / total) * 100, 1) if total else 0
-            mem_line = f'Memory: {used_mb}MB / {total_mb}MB ({percent}%)'
+        used_mb, total_mb, percent = _memory_winapi()
     except Exception:
-        pass
+        if wmic is None:
+            wmic = _wmic_values()
+        used_mb, total_mb, percent = _wmic_memory(wmic)
+    if total_mb is not None:
+        mem_line = f'Memory: {used_mb}MB / {total_mb}MB ({percent}%)'
 
-    # Processes via tasklist CSV -> produce simple table: PID | NAME | TYPE | MEM(MB) | MEM%
+    # Processes (native API, tasklist CSV as fallback) -> produce simple table: PID | NAME | TYPE | MEM(MB) | MEM%
     rows = []
     try:
-        out = subprocess.check_output(['tasklist', '/FO', 'CSV', '/NH'], stderr=subprocess.DEVNULL)
-        txt = out.decode(errors='ignore')
-        procs = _parse_tasklist_csv(txt)
+        try:
+            procs = _snapshot_windows_winapi()
+        except Exception:
+            import subprocess
+
+            out = subprocess.check_output(['tasklist', '/FO', 'CSV', '/NH'], stderr=subprocess.DEVNULL)
+            txt = out.decode(errors='ignore')
+            procs = _parse_tasklist_csv(txt)
         # procs: (name, pid, mem_mb, session_name, session_num)
-        procs.sort(key=lambda x: x[2], reverse=True)
-        iterable = procs if top is None else procs[:top]
+        by_mem = itemgetter(2)
+        iterable = sorted(procs, key=by_mem, reverse=True) if top is None else heapq.nlargest(top, procs, key=by_mem)
         for name, pid, mem, session_name, session_num in iterable:
-            ptype = 'service' if (session_name.lower() == 'services' or session_num == 0) else 'user'
+            # session 0 is the services session; tasklist names it exactly 'Services'
+            ptype = 'service' if session_num == 0 or session_name == 'Services' else 'user'
             rows.append((pid, name, ptype, mem))
     except Exception:
         rows = []
 
     if not rows:
-        print('No process information available')
-        return
+        return _NO_PROCESSES
 
     # total_mb was already calculated above during memory display, reuse it
+    return _format_table(rows, total_mb)
 
-    pid_w = max(3, max(len(str(r[0])) for r in rows))
-    name_w = max(4, min(40, max(len(r[1]) for r in rows)))
-    type_w = max(4, max(len(r[2]) for r in rows))
-    mem_w = max(7, max(len(str(r[3])) for r in rows) + 3)
-    mempct_w = 6
 
-    hdr = f"{'PID'.rjust(pid_w)}  {'NAME'.ljust(name_w)}  {'TYPE'.ljust(type_w)}  {'MEM(MB)'.rjust(mem_w)}  {'MEM%'.rjust(mempct_w)}"
-    print(hdr)
-    print('-' * len(hdr))
-    for pid, name, ptype, mem in rows:
-        mempct = round((mem / total_mb) * 100, 1) if total_mb else 0.0
-        print(f"{str(pid).rjust(pid_w)}  {name[:name_w].ljust(name_w)}  {ptype.ljust(type_w)}  {str(mem).rjust(mem_w)}  {str(mempct).rjust(mempct_w)}")
+def _read_proc_meminfo() -> Optional[int]:
+    """Return MemTotal from /proc/meminfo in MB, or None without /proc."""
+    try:
+        with open('/proc/meminfo', 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    _, sep, rest = data.partition(b'MemTotal:')
+    if not sep:
+        return None
+    return int(rest.split(None, 1)[0]) // 1024
+
 
+def _enumerate_proc(top: Optional[int]) -> List[Tuple[int, str, str, int]]:
+    """Top processes by RSS read straight from /proc/[pid]/stat.
+
+    Raises OSError where /proc is unavailable so the caller can fall back
+    to ps.
+    """
+    procs = []
+    append = procs.append
+    with os.scandir('/proc') as it:
+        for entry in it:
+            name = entry.name
+            if not name.isdigit():
+                continue
+            try:
+                with open(f'/proc/{name}/stat', 'rb') as f:
+                    data = f.read()
+            except OSError:
+                # exited since the directory was listed
+                continue
+            # comm is parenthesised and may itself contain spaces or ')'
+            head, _, tail = data.rpartition(b')')
+            fields = tail.split()
+            # fields[0] is stat field 3 (state): ppid is field 4, rss field 24
+            append((int(fields[21]), int(name), head.partition(b'(')[2], fields[1] == b'1'))
+    if not procs:
+        raise OSError('no processes found in /proc')
+    best = sorted(procs, reverse=True) if top is None else heapq.nlargest(top, procs)
+    page_kb = _PAGE_KB
+    return [(pid, comm.decode(errors='ignore'), 'service' if is_service else 'user', (rss * page_kb) // 1024)
+            for rss, pid, comm, is_service in best]
+
+
+def _ps_rows(top: Optional[int]) -> List[Tuple[int, str, str, int]]:
+    # Use RSS (KB) from ps to compute memory in MB
+    import subprocess
 
-def _snapshot_unix(top: int = 8) -> None:
-    # Use RSS (KB) from ps to compute memory in MB and print simple table
-    rows = []
     try:
-        out = subprocess.check_output(['ps', '-eo', 'pid,ppid,rss,comm', '--sort=-rss'], stderr=subprocess.DEVNULL)
-        txt = out.decode(errors='ignore')
-        lines = txt.splitlines()[1:top+1]
-        for ln in lines:
-            parts = ln.split(None, 3)
-            if len(parts) >= 4:
-                pid_s, ppid_s, rss_s, cmd = parts
-                try:
-                    pid = int(pid_s)
-                except Exception:
-                    pid = 0
-                try:
-                    ppid = int(ppid_s)
-                except Exception:
-                    ppid = -1
-                try:
-                    rss_k = int(rss_s)
-                    mem_mb = rss_k // 1024
-                except Exception:
-                    mem_mb = 0
-                ptype = 'service' if ppid == 1 else 'user'
-                rows.append((pid, cmd, ptype, mem_mb))
+        out = subprocess.check_output(['ps', '-eo', 'pid,ppid,rss,comm', '--sort=-rss', '--no-headers'], stderr=subprocess.DEVNULL, **_SPAWN_KW)
+        lines = out.splitlines()[:top]
+        # ps only prints numbers in the first three columns, so int() takes
+        # them straight from the bytes without per-field guards; ppid is
+        # compared undecoded and only the command name is decoded
+        return [(int(p[0]), p[3].decode(errors='ignore'), 'service' if p[1] == b'1' else 'user', int(p[2]) // 1024)
+                for p in (ln.split(None, 3) for ln in lines) if len(p) == 4]
     except Exception:
-        rows = []
-    if not rows:
-        print('No process information available')
-        return
+        return []
 
-    # get total memory from free -m for percentage calculations
-    total_mb = None
+
+def _snapshot_unix(top: int = 8) -> str:
+    # Linux exposes everything under /proc; elsewhere fall back to ps/free
     try:
-        out = subprocess.check_output(['free', '-m'], stderr=subprocess.DEVNULL).decode(errors='ignore')
-        for ln in out.splitlines():
-            if ln.lower().startswith('mem:'):
-                parts = ln.split()
-                total_mb = int(parts[1])
-                break
+        rows = _enumerate_proc(top)
     except Exception:
-        total_mb = None
+        rows = _ps_rows(top)
+    if not rows:
+        return _NO_PROCESSES
 
-    pid_w = max(3, max(len(str(r[0])) for r in rows))
-    name_w = max(4, min(40, max(len(r[1]) for r in rows)))
-    type_w = max(4, max(len(r[2]) for r in rows))
-    mem_w = max(7, max(len(str(r[3])) for r in rows) + 3)
-    mempct_w = 6
+    # total memory for percentage calculations
+    total_mb = _read_proc_meminfo()
+    if total_mb is None:
+        import subprocess
 
-    hdr = f"{'PID'.rjust(pid_w)}  {'NAME'.ljust(name_w)}  {'TYPE'.ljust(type_w)}  {'MEM(MB)'.rjust(mem_w)}  {'MEM%'.rjust(mempct_w)}"
-    print(hdr)
-    print('-' * len(hdr))
-    for pid, name, ptype, mem in rows:
-        mempct = round((mem / total_mb) * 100, 1) if total_mb else 0.0
-        print(f"{str(pid).rjust(pid_w)}  {name[:name_w].ljust(name_w)}  {ptype.ljust(type_w)}  {str(mem).rjust(mem_w)}  {str(mempct).rjust(mempct_w)}")
+        try:
+            out = subprocess.check_output(['free', '-m'], stderr=subprocess.DEVNULL, **_SPAWN_KW).decode(errors='ignore')
+            for ln in out.splitlines():
+                if ln.lower().startswith('mem:'):
+                    parts = ln.split()
+                    total_mb = int(parts[1])
+                    break
+        except Exception:
+            total_mb = None
 
+    return _format_table(rows, total_mb)
+
+
+def _wait_for_quit(delay: float, key_fd: Optional[int], is_win: bool) -> bool:
+    """Wait up to `delay` seconds; return True early if 'q' is pressed."""
+    if is_win and key_fd is not None:
+        import msvcrt
+
+        deadline = time.monotonic() + delay
+        while True:
+            while msvcrt.kbhit():
+                if msvcrt.getwch() in ('q', 'Q'):
+                    return True
+            left = deadline - time.monotonic()
+            if left <= 0:
+                return False
+            time.sleep(min(0.05, left))
+    if key_fd is None:
+        time.sleep(delay)
+        return False
+    import select
+
+    deadline = time.monotonic() + delay
+    while True:
+        left = deadline - time.monotonic()
+        if left <= 0:
+            return False
+        ready, _, _ = select.select([key_fd], [], [], left)
+        if ready:
+            key = os.read(key_fd, 1)
+            if not key:
+                # stdin closed; just sleep out the rest
+                time.sleep(max(0.0, deadline - time.monotonic()))
+                return False
+            if key in (b'q', b'Q'):
+                return True
+
+
+def _watch(is_win: bool, top: int, interval: float) -> None:
+    if is_win:
+        _enable_vt()
+    # single keypresses (q to quit) are only read from an interactive stdin;
+    # on Unix it is switched to cbreak mode for the session
+    key_fd = None
+    restore = None
+    try:
+        if sys.stdin.isatty():
+            key_fd = sys.stdin.fileno()
+    except (AttributeError, OSError, ValueError):
+        key_fd = None
+    if key_fd is not None and not is_win:
+        try:
+            import termios
+            import tty
+
+            saved = termios.tcgetattr(key_fd)
+            tty.setcbreak(key_fd)
+            restore = lambda: termios.tcsetattr(key_fd, termios.TCSADRAIN, saved)
+        except Exception:
+            key_fd = None
+    try:
+        _watch_loop(is_win, top, interval, key_fd)
+    finally:
+        if restore is not None:
+            restore()
+
+
+def _frame_writer():
+    """Return a function that writes a snapshot as one clear+text frame."""
+    out = sys.stdout
+    try:
+        fd = out.fileno()
+        encoding = out.encoding or 'utf-8'
+    except (AttributeError, OSError, ValueError):
+        fd = None
+    if fd is None or os.name == 'nt':
+        # the Windows console needs the text layer (newline translation and
+        # wide-character output), as does a stream without a descriptor
+        def write_text(text: str) -> None:
+            out.write(_CLEAR + text)
+            out.flush()
+        return write_text
+
+    frame = _FRAME
+    start = len(_CLEAR_B)
+    write = os.write
+
+    def write_frame(text: str) -> None:
+        data = text.encode(encoding, 'replace')
+        end = start + len(data)
+        if end > len(frame):
+            frame.extend(bytes(end - len(frame)))
+        # equal-length slice assignment copies in place without reallocating
+        frame[start:end] = data
+        with memoryview(frame)[:end] as view:
+            while view:
+                view = view[write(fd, view):]
+    out.flush()
+    return write_frame
+
+
+def _watch_loop(is_win: bool, top: int, interval: float, key_fd: Optional[int]) -> None:
+    # loop invariants resolved once
+    snapshot = _snapshot_windows if is_win else _snapshot_unix
+    emit = _frame_writer()
+    monotonic = time.monotonic
+    wait = _wait_for_quit
+    deadline = monotonic()
+    while True:
+        # clear sequence and snapshot go out as one frame in a single write,
+        # instead of forking a shell for cls/clear before the table
+        emit(snapshot(top=top))
+        # sleep to the next tick rather than a fixed interval so the time
+        # spent taking the snapshot doesn't accumulate as drift
+        deadline += interval
+        delay = deadline - monotonic()
+        if delay <= 0:
+            # fell behind; restart the schedule instead of bursting to catch up
+            deadline = monotonic()
+            delay = 0.0
+        if wait(delay, key_fd, is_win):
+            return
+
+
+def _parser():
+    # only built for --help and for arguments the fast path doesn't handle
+    import argparse
 
-def execute(args: List[str]) -> int:
     parser = argparse.ArgumentParser(prog='htop', add_help=False)
     parser.add_argument('--watch', '-w', type=float, nargs='?', const=1.0, help='continuously refresh every N seconds (default 1s)')
     parser.add_argument('--top', '-n', type=int, default=8, help='number of top processes to show')
     parser.add_argument('--all', action='store_true', help='show all processes')
     parser.add_argument('-h', '--help', action='store_true', dest='show_help')
+    return parser
 
-    ns = parser.parse_args(args)
+
+def _parse_args(args: List[str]) -> SimpleNamespace:
+    """Parse htop's four flags by hand; defer to argparse for anything else."""
+    ns = SimpleNamespace(watch=None, top=8, all=False, show_help=False)
+    i = 0
+    n = len(args)
+    try:
+        while i < n:
+            a = args[i]
+            if a in ('-w', '--watch'):
+                ns.watch = 1.0
+                # optional interval, as with argparse's nargs='?'
+                if i + 1 < n and not args[i + 1].startswith('-'):
+                    i += 1
+                    ns.watch = float(args[i])
+            elif a in ('-n', '--top'):
+                i += 1
+                ns.top = int(args[i])
+            elif a == '--all':
+                ns.all = True
+            elif a in ('-h', '--help'):
+                ns.show_help = True
+            else:
+                raise ValueError(a)
+            i += 1
+    except (IndexError, ValueError):
+        # unknown options, bad values, --opt=value, abbreviations: argparse
+        # gives the same result or the usual error
+        return _parser().parse_args(args)
+    return ns
+
+
+def execute(args: List[str]) -> int:
+    ns = _parse_args(args)
     if ns.show_help:
-        parser.print_help()
+        _parser().print_help()
         return 0
 
     is_win = os.name == 'nt'
@@ -247,18 +818,9 @@ def execute(args: List[str]) -> int:
     try:
         if ns.watch:
             interval = float(ns.watch)
-            while True:
-                os.system('cls' if is_win else 'clear')
-                if is_win:
-                    _snapshot_windows(top=ns.top)
-                else:
-                    _snapshot_unix(top=ns.top)
-                time.sleep(interval)
+            _watch(is_win, ns.top, interval)
         else:
-            if is_win:
-                _snapshot_windows(top=ns.top)
-            else:
-                _snapshot_unix(top=ns.top)
+            sys.stdout.write(_snapshot_windows(top=ns.top) if is_win else _snapshot_unix(top=ns.top))
 
         return 0
     except KeyboardInterrupt:
@@ -5,7 +5,9 @@ Usage examples:
   kill -9 1234       # send SIGKILL (force)
   kill -s KILL 1234  # named signal
 
-On Windows this uses `taskkill` under the hood (uses /F for -9).
+On Windows this first asks the process's windows to close (unless forced),
+then calls TerminateProcess; `taskkill /F` is only used when access is
+denied.
 """
 from __future__ import annotations
 
@@ -14,32 +16,78 @@ import sys
 import argparse
 import signal
 import subprocess
-from typing import List, Dict
+from typing import List, Dict, Tuple
 import csv
 import time
 import json
-# ctypes is only required on Windows when using WinAPI helpers; import lazily in those functions
-from pathlib import Path
+
+# also importable when this file is run directly as a script
+try:
+    from ._paths import kill_log_path
+except ImportError:
+    from _paths import kill_log_path
+
+if os.name == 'nt':
+    # WinAPI helpers for graceful close and TerminateProcess. Prototypes and
+    # the EnumWindows callback thunk are created once here rather than on
+    # every call; private WinDLL instances keep the argtypes local.
+    import ctypes
+    from ctypes import wintypes
+
+    _user32 = ctypes.WinDLL('user32', use_last_error=True)
+    _kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+
+    _ENUMPROC = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+
+    _EnumWindows = _user32.EnumWindows
+    _EnumWindows.argtypes = [_ENUMPROC, wintypes.LPARAM]
+    _EnumWindows.restype = wintypes.BOOL
+    _GetWindowThreadProcessId = _user32.GetWindowThreadProcessId
+    _GetWindowThreadProcessId.argtypes = [wintypes.HWND, ctypes.POINTER(wintypes.DWORD)]
+    _GetWindowThreadProcessId.restype = wintypes.DWORD
+    _IsWindowVisible = _user32.IsWindowVisible
+    _IsWindowVisible.argtypes = [wintypes.HWND]
+    _IsWindowVisible.restype = wintypes.BOOL
+    _PostMessageW = _user32.PostMessageW
+    _PostMessageW.argtypes = [wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM]
+    _PostMessageW.restype = wintypes.BOOL
+
+    _OpenProcess = _kernel32.OpenProcess
+    _OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+    _OpenProcess.restype = wintypes.HANDLE
+    _TerminateProcess = _kernel32.TerminateProcess
+    _TerminateProcess.argtypes = [wintypes.HANDLE, wintypes.UINT]
+    _TerminateProcess.restype = wintypes.BOOL
+    _CloseHandle = _kernel32.CloseHandle
+    _CloseHandle.argtypes = [wintypes.HANDLE]
+    _CloseHandle.restype = wintypes.BOOL
+
+    # scratch state for the EnumWindows callback: window owner PID and
+    # whether a WM_CLOSE was posted during the current enumeration
+    _enum_owner = wintypes.DWORD()
+    _enum_owner_ref = ctypes.byref(_enum_owner)
+    _enum_posted = [False]
+
+    def _close_windows_cb(hwnd, target_pid):
+        _GetWindowThreadProcessId(hwnd, _enum_owner_ref)
+        if _enum_owner.value == target_pid and _IsWindowVisible(hwnd):
+            _PostMessageW(hwnd, _WM_CLOSE, 0, 0)
+            _enum_posted[0] = True
+        return True
+
+    _CLOSE_WINDOWS_CB = _ENUMPROC(_close_windows_cb)
+
+_WM_CLOSE = 0x0010
+_PROCESS_TERMINATE = 0x0001
+_ERROR_ACCESS_DENIED = 5
 
 # processes we will protect by default from accidental kills unless --force is used
 PROTECTED_NAMES = {
     'explorer.exe', 'winlogon.exe', 'lsass.exe', 'csrss.exe', 'dwm.exe',
     'svchost.exe', 'services.exe', 'System', 'System Idle Process', 'sihost.exe'
 }
-
-
-# Kill log location: allow override for portability. Priority:
-# 1) WILX_KILL_LOG env var
-# 2) project-local .wilx_kill_log (repo root)
-# 3) fallback to home dir
-_ENV_LOG = os.environ.get('WILX_KILL_LOG')
-if _ENV_LOG:
-    _KILL_LOG = Path(_ENV_LOG).expanduser()
-else:
-    try:
-        _KILL_LOG = (Path(__file__).resolve().parents[1] / '.wilx_kill_log').expanduser()
-    except Exception:
-        _KILL_LOG = Path(os.path.expanduser('~')) / '.wilx_kill_log'
+# case-folded once for case-insensitive membership tests
+_PROTECTED_CF = frozenset(n.casefold() for n in PROTECTED_NAMES)
 
 
 def _signal_to_int(sig: str) -> int:
@@ -62,8 +110,8 @@ def _signal_to_int(sig: str) -> int:
 def _get_proc_names(pids: List[int]) -> Dict[int, str]:
     """Return a dict mapping PID to process name for multiple PIDs (batched lookup).
 
-    On Windows, this batches all PIDs in a single tasklist call for efficiency.
-    On Unix, falls back to individual ps calls (could be optimized further).
+    All PIDs are looked up with a single tasklist (Windows) or ps call;
+    on Linux the names are read from /proc instead.
     """
     result: dict[int, str] = {}
     if not pids:
@@ -108,18 +156,30 @@ def _get_proc_names(pids: List[int]) -> Dict[int, str]:
                                 continue
             except Exception:
                 pass
-        else:
-            # Unix: for multiple PIDs, could optimize with single ps call
-            # For now, use individual calls (could be improved)
+        elif os.path.isdir('/proc/self'):
+            # Linux: the name ps would print is in /proc/<pid>/comm, so no
+            # process has to be spawned
             for pid in pids:
                 try:
-                    out = subprocess.check_output(
-                        ['ps', '-p', str(pid), '-o', 'comm='],
-                        stderr=subprocess.DEVNULL
-                    )
-                    result[pid] = out.decode(errors='ignore').strip()
-                except Exception:
-                    pass
+                    with open(f'/proc/{pid}/comm', 'rb') as f:
+                        result[pid] = f.read().decode(errors='ignore').strip()
+                except OSError:
+                    continue
+        else:
+            # other Unix: one ps call for all PIDs; ps exits non-zero when some
+            # of them don't exist, so read its output regardless of the status
+            proc = subprocess.run(
+                ['ps', '-p', ','.join(map(str, pids)), '-o', 'pid=,comm='],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+            for line in proc.stdout.decode(errors='ignore').splitlines():
+                parts = line.split(None, 1)
+                if len(parts) == 2:
+                    try:
+                        result[int(parts[0])] = parts[1].strip()
+                    except ValueError:
+                        continue
     except Exception:
         pass
 
@@ -138,58 +198,59 @@ def _get_proc_name(pid: int) -> str:
 def _win_graceful_close(pid: int) -> bool:
     """Attempt to post WM_CLOSE to top-level windows belonging to the pid. Returns True if at least one message posted."""
     try:
-        import ctypes
-        from ctypes import wintypes
-        user32 = ctypes.windll.user32
-
-        # workaround for modifying outer scope in older Pythons: use a mutable array
-        nonlocal_posted = (wintypes.DWORD * 1)(0)
-
-        # callback for EnumWindows
-        def enum_cb(hwnd, lParam):
-            pid_arr = wintypes.DWORD()
-            user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid_arr))
-            if pid_arr.value == pid and user32.IsWindowVisible(hwnd):
-                user32.PostMessageW(hwnd, 0x0010, 0, 0)  # WM_CLOSE
-                nonlocal_posted[0] = 1
-            return True
-
-        ENUMPROC = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
-        enum_proc = ENUMPROC(enum_cb)
-        user32.EnumWindows(enum_proc, 0)
-        return bool(nonlocal_posted[0])
+        _enum_posted[0] = False
+        # the target PID travels in lParam to the shared callback
+        _EnumWindows(_CLOSE_WINDOWS_CB, pid)
+        return _enum_posted[0]
     except Exception:
         return False
 
 
-def _win_terminate(pid: int) -> bool:
-    """Attempt to terminate process via TerminateProcess. Returns True on success."""
+def _win_terminate(pid: int) -> Tuple[bool, int]:
+    """Attempt to terminate process via TerminateProcess.
+
+    Returns (success, GetLastError() of the failing call).
+    """
     try:
-        import ctypes
-        from ctypes import wintypes
-        PROCESS_TERMINATE = 0x0001
-        kernel32 = ctypes.windll.kernel32
-        h = kernel32.OpenProcess(PROCESS_TERMINATE, False, int(pid))
+        h = _OpenProcess(_PROCESS_TERMINATE, False, int(pid))
         if not h:
-            return False
-        res = kernel32.TerminateProcess(h, 1)
-        kernel32.CloseHandle(h)
-        return bool(res)
+            return False, ctypes.get_last_error()
+        try:
+            if _TerminateProcess(h, 1):
+                return True, 0
+            return False, ctypes.get_last_error()
+        finally:
+            _CloseHandle(h)
     except Exception:
-        return False
+        return False, 0
+
+
+# kill-log entries collected during one execute() and written together
+_PENDING_LOG: List[dict] = []
 
 
 def _log_kill(entry: dict) -> None:
+    _PENDING_LOG.append(entry)
+
+
+def _flush_kill_log() -> None:
+    """Append the pending entries to the kill log with a single open and write."""
+    if not _PENDING_LOG:
+        return
+    log_path = kill_log_path()
     try:
         # ensure parent exists when using project-local paths
         try:
-            _KILL_LOG.parent.mkdir(parents=True, exist_ok=True)
+            log_path.parent.mkdir(parents=True, exist_ok=True)
         except Exception:
             pass
-        with open(str(_KILL_LOG), 'a', encoding='utf-8') as f:
-            f.write(json.dumps(entry) + '\n')
+        data = '\n'.join(json.dumps(e) for e in _PENDING_LOG) + '\n'
+        with open(str(log_path), 'a', encoding='utf-8', buffering=1 << 16) as f:
+            f.write(data)
     except Exception:
         pass
+    finally:
+        _PENDING_LOG.clear()
 
 
 def execute(argv: List[str]) -> int:
@@ -223,9 +284,20 @@ def execute(argv: List[str]) -> int:
             print(f'kill: invalid pid: {p}', file=sys.stderr)
             continue
 
-    # Batch fetch process names for efficiency
+    # Batch fetch process names: checked against PROTECTED_NAMES and kept
+    # in the kill log
     proc_names = _get_proc_names(pid_list)
 
+    ok = True
+    try:
+        ok = _kill_all(ns, sig, signum, proc_names, is_win)
+    finally:
+        _flush_kill_log()
+    return 0 if ok else 1
+
+
+def _kill_all(ns, sig: str, signum: int, proc_names: Dict[int, str], is_win: bool) -> bool:
+    """Signal every PID in `ns.pids`; return False if any of them failed."""
     ok = True
     for p in ns.pids:
         try:
@@ -235,7 +307,8 @@ def execute(argv: List[str]) -> int:
             continue
 
         pname = proc_names.get(pid, '')
-        protected = pname.lower() in (n.lower() for n in PROTECTED_NAMES)
+        # an unknown name ('') can't match anything
+        protected = bool(pname) and pname.casefold() in _PROTECTED_CF
 
         if protected and not ns.force:
             print(f'kill: refusing to kill protected process {pname} ({pid}) without --force', file=sys.stderr)
@@ -265,16 +338,15 @@ def execute(argv: List[str]) -> int:
                         did = _win_graceful_close(pid)
                     except Exception:
                         did = False
-                # If force requested, or graceful failed, attempt TerminateProcess
-                if ns.force and not did:
-                    terminated = _win_terminate(pid)
-                    did = bool(terminated)
-                # fallback to taskkill if WinAPI didn't work
+                # If force requested, or graceful failed, TerminateProcess directly
                 if not did:
-                    cmd = ['taskkill', '/PID', str(pid)]
-                    if signum == (_signal_to_int('KILL') if hasattr(signal, 'SIGKILL') else 9):
-                        cmd.append('/F')
-                    subprocess.check_call(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                    did, err = _win_terminate(pid)
+                    if not did:
+                        if err != _ERROR_ACCESS_DENIED:
+                            raise ctypes.WinError(err) if err else OSError('TerminateProcess failed')
+                        # only spawn taskkill when we lack the rights to do it ourselves
+                        subprocess.check_call(['taskkill', '/F', '/PID', str(pid)],
+                                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
             else:
                 os.kill(pid, signum)
 
@@ -285,7 +357,7 @@ def execute(argv: List[str]) -> int:
             print(f'kill: failed to kill {pid}: {e}', file=sys.stderr)
             ok = False
 
-    return 0 if ok else 1
+    return ok
 
 
 def main() -> None:
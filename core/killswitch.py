@@ -16,39 +16,71 @@ import sys
 import json
 import time
 import argparse
+import itertools
 import subprocess
-from typing import List
-from pathlib import Path
+from typing import Iterator, List, Optional
 
+# also importable when this file is run directly as a script
+try:
+    from ._paths import kill_log_path
+except ImportError:
+    from _paths import kill_log_path
 
-_ENV_LOG = os.environ.get('WILX_KILL_LOG')
-if _ENV_LOG:
-    LOG_PATH = Path(_ENV_LOG).expanduser()
-else:
+
+# block size for reading the log backwards
+_TAIL_BLOCK = 1 << 16
+# one decoder for every log line; skips json.loads' argument handling and
+# encoding sniffing (the log is always written as UTF-8)
+_DECODE = json.JSONDecoder().decode
+
+
+def _iter_log_reversed() -> Iterator[dict]:
+    """Yield log entries newest first, reading the file backwards in blocks.
+
+    Only the part of the log that is actually consumed gets read and parsed.
+    """
     try:
-        LOG_PATH = (Path(__file__).resolve().parents[1] / '.wilx_kill_log').expanduser()
-    except Exception:
-        LOG_PATH = Path(os.path.expanduser('~')) / '.wilx_kill_log'
+        f = open(str(kill_log_path()), 'rb')
+    except OSError:
+        return
+    with f:
+        try:
+            pos = f.seek(0, os.SEEK_END)
+        except OSError:
+            return
+        # bytes of a line that started before the block just read
+        partial = b''
+        while pos > 0:
+            step = min(_TAIL_BLOCK, pos)
+            pos -= step
+            f.seek(pos)
+            lines = (f.read(step) + partial).split(b'\n')
+            # the first piece may continue in the previous block
+            partial = lines[0]
+            for ln in reversed(lines[1:]):
+                entry = _parse_line(ln)
+                if entry is not None:
+                    yield entry
+        entry = _parse_line(partial)
+        if entry is not None:
+            yield entry
 
 
-def _read_log() -> List[dict]:
-    p = Path(str(LOG_PATH))
-    if not p.exists():
-        return []
-    out = []
+def _parse_line(ln: bytes) -> Optional[dict]:
+    ln = ln.strip()
+    if not ln:
+        return None
     try:
-        with p.open('r', encoding='utf-8') as f:
-            for ln in f:
-                ln = ln.strip()
-                if not ln:
-                    continue
-                try:
-                    out.append(json.loads(ln))
-                except Exception:
-                    continue
+        return _DECODE(ln.decode('utf-8'))
     except Exception:
-        return []
-    return out
+        return None
+
+
+def _read_log_tail(n: int) -> List[dict]:
+    """Return the last `n` log entries, oldest first."""
+    tail = list(itertools.islice(_iter_log_reversed(), n))
+    tail.reverse()
+    return tail
 
 
 def execute(argv: List[str]) -> int:
@@ -59,12 +91,12 @@ def execute(argv: List[str]) -> int:
     parser.add_argument('--yes', '-y', action='store_true', help='assume yes for confirmations')
     ns = parser.parse_args(argv)
 
-    logs = _read_log()
     if ns.list:
+        logs = _read_log_tail(50)
         if not logs:
             print('No kills recorded in log.')
             return 0
-        for e in logs[-50:]:
+        for e in logs:
             t = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(e.get('time', 0)))
             print(f"{t} PID={e.get('pid')} NAME={e.get('name')} SIGNAL={e.get('signal')} FORCE={e.get('force')}")
         return 0
@@ -75,7 +107,7 @@ def execute(argv: List[str]) -> int:
             return 1
         # check log for explorer kills
         found = False
-        for e in reversed(logs):
+        for e in _iter_log_reversed():
             if (e.get('name') or '').lower() == 'explorer.exe':
                 found = True
                 break
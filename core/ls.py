@@ -15,50 +15,81 @@ from __future__ import annotations
 
 import os
 import sys
-import argparse
-import datetime
+import functools
 import stat
 import shutil
 import math
 import textwrap
+import time
+from operator import itemgetter
 from typing import List
 
+from utils.helpers import is_hidden, parse_flags
+
+
+def _build_perm_table() -> List[str]:
+    """'rwxr-xr-x'-style strings for every value of the low 9 mode bits."""
+    table = []
+    for bits in range(0o1000):
+        table.append(''.join(
+            'rwx'[j % 3] if bits & (0o400 >> j) else '-' for j in range(9)
+        ))
+    return table
+
+
+_PERM_TABLE = _build_perm_table()
+
 
 def format_mode(mode: int) -> str:
     """Return a human readable file mode similar to ls -l (e.g. '-rwxr-xr-x').
 
-    This is a simplified representation using stat flags.
+    This is a simplified representation using stat flags; the permission
+    part is a lookup in a table built at import.
     """
-    is_dir = 'd' if stat.S_ISDIR(mode) else '-'
-    perms = []
-    flags = (
-        (stat.S_IRUSR, stat.S_IWUSR, stat.S_IXUSR),
-        (stat.S_IRGRP, stat.S_IWGRP, stat.S_IXGRP),
-        (stat.S_IROTH, stat.S_IWOTH, stat.S_IXOTH),
-    )
-    for triplet in flags:
-        perms.append('r' if mode & triplet[0] else '-')
-        perms.append('w' if mode & triplet[1] else '-')
-        perms.append('x' if mode & triplet[2] else '-')
+    return ('d' if stat.S_ISDIR(mode) else '-') + _PERM_TABLE[mode & 0o777]
 
-    return is_dir + ''.join(perms)
+
+@functools.lru_cache(maxsize=4096)
+def _format_minute(minute: int) -> str:
+    return time.strftime('%Y-%m-%d %H:%M', time.localtime(minute * 60))
 
 
 def format_mtime(ts: float) -> str:
-    dt = datetime.datetime.fromtimestamp(ts)
-    return dt.strftime('%Y-%m-%d %H:%M')
+    # ls -l only shows minutes, and files in one directory often share the
+    # same minute, so the formatted string is cached per minute
+    return _format_minute(int(ts // 60))
 
 
-def _get_owner_group(st):
-    """Try to return owner and group names; return ('', '') when unavailable."""
+try:
+    import pwd, grp  # type: ignore
+except ImportError:
+    # Windows: no user/group databases
+    pwd = grp = None
+
+
+@functools.lru_cache(maxsize=None)
+def _uid_name(uid: int) -> str:
     try:
-        import pwd, grp  # type: ignore
+        return pwd.getpwuid(uid).pw_name
+    except Exception:
+        return ''
+
 
-        owner = pwd.getpwuid(st.st_uid).pw_name
-        group = grp.getgrgid(st.st_gid).gr_name
-        return owner, group
+@functools.lru_cache(maxsize=None)
+def _gid_name(gid: int) -> str:
+    try:
+        return grp.getgrgid(gid).gr_name
     except Exception:
-        return '', ''
+        return ''
+
+
+def _get_owner_group(st):
+    """Try to return owner and group names; return '' for those unavailable.
+
+    Lookups are cached per uid/gid, so a listing costs one NSS query per
+    distinct owner rather than one per entry.
+    """
+    return _uid_name(st.st_uid), _gid_name(st.st_gid)
 
 
 def _print_columns(entries: List[str], term_width: int = None) -> None:
@@ -81,26 +112,33 @@ def _print_columns(entries: List[str], term_width: int = None) -> None:
     cols = max(1, term_width // col_width)
     rows = math.ceil(len(entries) / cols)
 
-    # build grid
-    grid = []
-    for r in range(rows):
-        row_items = []
-        for c in range(cols):
-            idx = c * rows + r
-            if idx < len(entries):
-                row_items.append(entries[idx])
-            else:
-                row_items.append('')
-        grid.append(row_items)
-
-    for row in grid:
-        line = ''
-        for item in row:
-            if item:
-                line += item.ljust(col_width)
-            else:
-                line += ' ' * col_width
-        print(line.rstrip())
+    # row r holds entries r, r + rows, r + 2*rows, ... (column-major fill);
+    # missing cells at the end of a row are just trailing padding
+    lines = [
+        ''.join([e.ljust(col_width) for e in entries[r::rows]]).rstrip()
+        for r in range(rows)
+    ]
+    # one write for the whole grid instead of a print() per row
+    lines.append('')
+    sys.stdout.write('\n'.join(lines))
+
+
+_FLAGS = {
+    '-a': 'all', '--all': 'all',
+    '-l': 'long', '--long': 'long',
+    '-h': 'show_help', '--help': 'show_help',
+}
+
+
+def _parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='ls', add_help=False)
+    parser.add_argument('-a', '--all', action='store_true', help='do not ignore entries starting with .')
+    parser.add_argument('-l', '--long', action='store_true', help='use a long listing format')
+    parser.add_argument('-h', '--help', action='store_true', dest='show_help', help='show this help message')
+    parser.add_argument('paths', nargs='*', default=['.'], help='paths to list')
+    return parser
 
 
 def execute(args: List[str]) -> int:
@@ -112,16 +150,12 @@ def execute(args: List[str]) -> int:
     Returns
     - integer exit code (0 success, non-zero on errors)
     """
-    parser = argparse.ArgumentParser(prog='ls', add_help=False)
-    parser.add_argument('-a', '--all', action='store_true', help='do not ignore entries starting with .')
-    parser.add_argument('-l', '--long', action='store_true', help='use a long listing format')
-    parser.add_argument('-h', '--help', action='store_true', dest='show_help', help='show this help message')
-    parser.add_argument('paths', nargs='*', default=['.'], help='paths to list')
-
-    ns = parser.parse_args(args)
+    ns = parse_flags(args, _FLAGS, 'paths', _parser)
     if ns.show_help:
-        parser.print_help()
+        _parser().print_help()
         return 0
+    if not ns.paths:
+        ns.paths = ['.']
 
     # Cache terminal width once per command execution
     try:
@@ -139,21 +173,25 @@ def execute(args: List[str]) -> int:
             if os.path.isdir(target):
                 # Use os.scandir() for better performance, filtering during iteration
                 base = target
-                entries = []
+                # (name, DirEntry) pairs; -l stats through the DirEntry, which
+                # reuses the stat data the directory read already returned
+                # on Windows and caches it elsewhere. The hidden-name test is
+                # chosen once here rather than evaluated per entry.
                 try:
                     with os.scandir(target) as it:
-                        for entry in it:
-                            name = entry.name
-                            if ns.all or not name.startswith('.'):
-                                entries.append(name)
+                        if ns.all:
+                            items = [(e.name, e) for e in it]
+                        else:
+                            items = [(e.name, e) for e in it if not is_hidden(e.name)]
                 except Exception:
                     # Fallback to os.listdir if scandir fails
-                    entries = os.listdir(target)
-                    if not ns.all:
-                        entries = [e for e in entries if not e.startswith('.')]
+                    if ns.all:
+                        items = [(name, None) for name in os.listdir(target)]
+                    else:
+                        items = [(name, None) for name in os.listdir(target) if not is_hidden(name)]
             else:
                 # path is a file — show that single entry
-                entries = [os.path.basename(target)]
+                items = [(os.path.basename(target), None)]
                 base = os.path.dirname(target) or '.'
         except FileNotFoundError:
             print(f"ls: cannot access '{target}': No such file or directory", file=sys.stderr)
@@ -164,7 +202,7 @@ def execute(args: List[str]) -> int:
             exit_code = 2
             continue
 
-        entries.sort()
+        items.sort(key=itemgetter(0))
 
         if ns.long:
             # gather stats first to compute column widths
@@ -173,32 +211,38 @@ def execute(args: List[str]) -> int:
             col_owner = 0
             col_group = 0
             col_size = 0
-            for name in entries:
-                full = os.path.join(base, name)
+            for name, entry in items:
                 try:
-                    st = os.lstat(full)
+                    if entry is not None:
+                        st = entry.stat(follow_symlinks=False)
+                    else:
+                        st = os.lstat(os.path.join(base, name))
                 except FileNotFoundError:
                     # race / broken symlink — skip
                     continue
                 mode = format_mode(st.st_mode)
-                nlink = getattr(st, 'st_nlink', 1)
-                size = st.st_size
+                # numbers are stringified once and measured from the string
+                # DirEntry.stat() on Windows reports st_nlink as 0
+                nlink_s = str(getattr(st, 'st_nlink', 0) or 1)
+                size_s = str(st.st_size)
                 mtime = format_mtime(st.st_mtime)
                 owner, group = _get_owner_group(st)
-                col_nlink = max(col_nlink, len(str(nlink)))
+                col_nlink = max(col_nlink, len(nlink_s))
                 col_owner = max(col_owner, len(owner))
                 col_group = max(col_group, len(group))
-                col_size = max(col_size, len(str(size)))
-                rows.append((mode, nlink, owner, group, size, mtime, name))
+                col_size = max(col_size, len(size_s))
+                rows.append((mode, nlink_s, owner, group, size_s, mtime, name))
 
-            for mode, nlink, owner, group, size, mtime, name in rows:
+            lines = []
+            for mode, nlink_s, owner, group, size_s, mtime, name in rows:
                 # owner/group may be empty strings on Windows; leave spacing compact
                 owner_field = owner.ljust(col_owner) if owner else ''
                 group_field = group.ljust(col_group) if group else ''
-                print(f"{mode} {str(nlink).rjust(col_nlink)} {owner_field} {group_field} {str(size).rjust(col_size)} {mtime} {name}")
+                lines.append(f"{mode} {nlink_s.rjust(col_nlink)} {owner_field} {group_field} {size_s.rjust(col_size)} {mtime} {name}\n")
+            sys.stdout.write(''.join(lines))
         else:
             # pretty column output
-            _print_columns(entries, term_width)
+            _print_columns([name for name, _ in items], term_width)
 
         # print a blank line between multiple targets
         if len(ns.paths) > 1:
@@ -15,17 +15,16 @@ This keeps output plain-text and avoids external dependencies.
 
 from __future__ import annotations
 
-import importlib
 import shutil
-import sys
 import textwrap
 from typing import List
 import io
 import contextlib
 
+from utils.helpers import get_command_module, list_core_commands
 
-def _wrap(text: str) -> str:
-    width = shutil.get_terminal_size((80, 20)).columns
+
+def _wrap(text: str, width: int) -> str:
     return textwrap.fill(text.strip(), width=width)
 
 
@@ -33,7 +32,8 @@ def _capture_help(module) -> str:
     """Call module.execute(['--help']) and capture stdout/stderr if possible."""
     buf = io.StringIO()
     try:
-        with contextlib.redirect_stdout(buf):
+        # argparse error/usage output goes to stderr; keep it in the page too
+        with contextlib.redirect_stdout(buf), contextlib.redirect_stderr(buf):
             # Some modules expect '-h' or '--help' to be present; many use add_help=False
             try:
                 module.execute(['--help'])
@@ -47,24 +47,17 @@ def _capture_help(module) -> str:
 
 def execute(args: List[str]) -> int:
     if not args:
-        # list available commands
-        try:
-            import os
-            core_dir = os.path.join(os.path.dirname(__file__))
-            files = [f[:-3] for f in os.listdir(core_dir) if f.endswith('.py') and not f.startswith('_')]
-            files.sort()
-            print("Available commands in core/:")
-            for f in files:
-                print(f"  {f}")
-            return 0
-        except Exception as e:
-            print(f"man: error listing commands: {e}", file=sys.stderr)
-            return 1
+        # list available commands (shared, cached scan of core/)
+        print("Available commands in core/:")
+        for f in list_core_commands():
+            print(f"  {f}")
+        return 0
 
     rc = 0
+    width = shutil.get_terminal_size((80, 20)).columns
     for name in args:
         try:
-            module = importlib.import_module(f'core.{name}')
+            module = get_command_module(name)
         except ModuleNotFoundError:
             print(f"No manual entry for {name}")
             rc = 2
@@ -78,7 +71,7 @@ def execute(args: List[str]) -> int:
         print(header)
         print('-' * len(header))
         doc = module.__doc__ or '(no documentation available)'
-        print(_wrap(doc))
+        print(_wrap(doc, width))
         print()
         print('SYNOPSIS:')
         help_text = _capture_help(module)
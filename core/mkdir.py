@@ -6,37 +6,83 @@ Usage: mkdir [-p] PATH...
 from __future__ import annotations
 
 import os
-import argparse
 import sys
-from typing import List
+from typing import List, Set
 
+from utils.helpers import parse_flags
+
+
+def _makedirs_cached(path: str, known: Set[str]) -> None:
+    """os.makedirs(path, exist_ok=True) that remembers directories it has seen.
+
+    `known` holds directories already created or found existing during this
+    invocation, so paths sharing a prefix don't stat it again.
+    """
+    if path in known:
+        return
+    head, tail = os.path.split(path)
+    if not tail:
+        head, tail = os.path.split(head)
+    if head and tail and head not in known:
+        if os.path.exists(head):
+            known.add(head)
+        else:
+            _makedirs_cached(head, known)
+    if tail == os.curdir:
+        # 'a/.' is 'a', which now exists
+        known.add(path)
+        return
+    try:
+        os.mkdir(path)
+    except FileExistsError:
+        if not os.path.isdir(path):
+            raise
+    known.add(path)
+
+
+_FLAGS = {
+    '-p': 'parents', '--parents': 'parents',
+    '-h': 'show_help', '--help': 'show_help',
+}
+
+
+def _parser():
+    import argparse
 
-def execute(args: List[str]) -> int:
     parser = argparse.ArgumentParser(prog='mkdir', add_help=False)
     parser.add_argument('-p', '--parents', action='store_true', help='make parent directories as needed')
     parser.add_argument('paths', nargs='+')
     parser.add_argument('-h', '--help', action='store_true', dest='show_help')
+    return parser
+
 
-    ns = parser.parse_args(args)
+def execute(args: List[str]) -> int:
+    ns = parse_flags(args, _FLAGS, 'paths', _parser)
     if ns.show_help:
-        parser.print_help()
+        _parser().print_help()
         return 0
 
-    rc = 0
+    if not ns.paths:
+        print('mkdir: missing operand', file=sys.stderr)
+        return 2
+
+    known: Set[str] = set()
+    errors = []
     for p in ns.paths:
         try:
             if ns.parents:
-                os.makedirs(p, exist_ok=True)
+                _makedirs_cached(p, known)
             else:
                 os.mkdir(p)
         except FileExistsError:
-            print(f"mkdir: cannot create directory '{p}': File exists", file=sys.stderr)
-            rc = 1
+            errors.append(f"mkdir: cannot create directory '{p}': File exists")
         except PermissionError:
-            print(f"mkdir: cannot create directory '{p}': Permission denied", file=sys.stderr)
-            rc = 1
+            errors.append(f"mkdir: cannot create directory '{p}': Permission denied")
         except Exception as e:
-            print(f"mkdir: {e}", file=sys.stderr)
-            rc = 1
+            errors.append(f"mkdir: {e}")
 
-    return rc
+    if errors:
+        # reported together once all paths have been tried
+        sys.stderr.write('\n'.join(errors) + '\n')
+        return 1
+    return 0
@@ -6,21 +6,57 @@ Usage: mv SOURCE... DEST
 from __future__ import annotations
 
 import shutil
-import argparse
 import sys
 import os
 from typing import List
 
+from utils.helpers import parse_flags
+
+
+_SEPS = os.sep + (os.altsep or '')
+
+
+def _move(src: str, dest: str, dest_is_dir: bool) -> None:
+    """Move `src` to `dest` (into it when it is a directory).
+
+    Tries a single os.replace first; anything it can't do (cross-device
+    moves, existing targets, moving a directory into itself, ...) is left
+    to shutil.move, which keeps its semantics and error messages.
+    """
+    if dest_is_dir:
+        target = os.path.join(dest, os.path.basename(src.rstrip(_SEPS)))
+        if os.path.lexists(target):
+            # shutil.move refuses to overwrite inside a directory
+            shutil.move(src, dest)
+            return
+    else:
+        target = dest
+    try:
+        os.replace(src, target)
+    except OSError:
+        shutil.move(src, dest)
+
+
+_FLAGS = {
+    '--dry-run': 'dry_run',
+    '-h': 'show_help', '--help': 'show_help',
+}
+
+
+def _parser():
+    import argparse
 
-def execute(args: List[str]) -> int:
     parser = argparse.ArgumentParser(prog='mv', add_help=False)
     parser.add_argument('--dry-run', action='store_true', help="show what would be done, but don't actually move files")
     parser.add_argument('paths', nargs='+')
     parser.add_argument('-h', '--help', action='store_true', dest='show_help')
+    return parser
+
 
-    ns = parser.parse_args(args)
+def execute(args: List[str]) -> int:
+    ns = parse_flags(args, _FLAGS, 'paths', _parser)
     if ns.show_help:
-        parser.print_help()
+        _parser().print_help()
         return 0
 
     paths = ns.paths
@@ -41,13 +77,13 @@ def execute(args: List[str]) -> int:
                 if ns.dry_run:
                     print(action)
                 else:
-                    shutil.move(s, dest)
+                    _move(s, dest, True)
         else:
             action = f"move '{sources[0]}' -> '{dest}'"
             if ns.dry_run:
                 print(action)
             else:
-                shutil.move(sources[0], dest)
+                _move(sources[0], dest, os.path.isdir(dest))
     except Exception as e:
         print(f"mv: {e}", file=sys.stderr)
         return 1
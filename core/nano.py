@@ -12,37 +12,113 @@ easy-to-use in-terminal editing experience without external dependencies.
 """
 from __future__ import annotations
 
+import mmap
 import os
+import stat
 import sys
 import argparse
 import time
-from typing import List
+from bisect import bisect_right
+from collections import deque
+from typing import Dict, List
 
 
 def _usage():
     return "Usage: nano [filename] — Ctrl-S save, Ctrl-Q quit (in curses mode)"
 
 
+# byte values the curses editor handles as commands rather than inserting:
+# Ctrl-F, Backspace (^H), Enter, Ctrl-O, Ctrl-Q, Ctrl-S, Ctrl-U, DEL
+_COMMAND_KEYS = frozenset((6, 8, 10, 15, 17, 19, 21, 127))
+
+# history lines recorded by saves but not yet written, per history file
+_PENDING_HISTORY: Dict[str, List[str]] = {}
+# flush early once this many saves are pending
+_HISTORY_FLUSH_AT = 16
+
+
 def _append_history(history_file: str | None, path: str) -> None:
     if not history_file:
         return
+    pending = _PENDING_HISTORY.setdefault(history_file, [])
+    pending.append(f"{int(time.time())}\t{path}\n")
+    if len(pending) >= _HISTORY_FLUSH_AT:
+        _flush_history()
+
+
+def _flush_history() -> None:
+    """Append the pending history lines with one open and write per file."""
+    for history_file, lines in _PENDING_HISTORY.items():
+        try:
+            p = os.path.expanduser(history_file)
+            d = os.path.dirname(p)
+            if d:
+                os.makedirs(d, exist_ok=True)
+            with open(p, 'a', encoding='utf-8') as f:
+                f.write(''.join(lines))
+        except Exception:
+            pass
+    _PENDING_HISTORY.clear()
+
+
+# files at least this large are decoded straight from a read-only mapping
+_MMAP_MIN_SIZE = 1 << 20
+
+
+def _decode_file(f) -> str:
+    """Decode the binary file `f` as UTF-8, dropping undecodable bytes.
+
+    Large regular files are decoded directly from an mmap, so the file's
+    bytes are never copied into an intermediate bytes object.
+    """
     try:
-        p = os.path.expanduser(history_file)
-        d = os.path.dirname(p)
-        if d:
-            os.makedirs(d, exist_ok=True)
-        with open(p, 'a', encoding='utf-8') as f:
-            f.write(f"{int(time.time())}\t{path}\n")
-    except Exception:
-        pass
+        st = os.fstat(f.fileno())
+    except (AttributeError, OSError, ValueError):
+        st = None
+    if st is not None and stat.S_ISREG(st.st_mode) and st.st_size >= _MMAP_MIN_SIZE:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            mm = None
+        if mm is not None:
+            with mm:
+                if hasattr(mm, 'madvise'):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                # str() decodes from the buffer without copying it first
+                return str(mm, 'utf-8', 'ignore')
+    return f.read().decode('utf-8', 'ignore')
+
+
+def _read_lines(path: str) -> List[str]:
+    """Read `path` as a list of lines without their line endings.
+
+    One binary read (or mapping), one decode and one split, all done in C.
+    Only \n, \r\n and \r end a line, as with a text-mode open();
+    str.splitlines() would also split on form feeds and other separators.
+    """
+    with open(path, 'rb') as f:
+        text = _decode_file(f)
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    lines = text.split('\n')
+    if not lines[-1]:
+        # trailing newline (or empty file)
+        lines.pop()
+    return lines
+
+
+def _write_lines(path: str, lines: List[str]) -> None:
+    """Write `lines` to `path`, each followed by a newline, in a single write."""
+    with open(path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        if lines:
+            f.write('\n'.join(lines) + '\n')
 
 
 def _run_line_editor(path: str, show_line_numbers: bool = False, history_file: str | None = None) -> int:
     # Very simple fallback: show lines, allow commands to edit.
-    if os.path.exists(path):
-        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = [ln.rstrip('\n') for ln in f]
-    else:
+    try:
+        lines = _read_lines(path)
+    except FileNotFoundError:
         lines = []
 
     print('Simple nano fallback — line editor')
@@ -85,9 +161,7 @@ def _run_line_editor(path: str, show_line_numbers: bool = False, history_file: s
             continue
         if cmd == 'w':
             try:
-                with open(path, 'w', encoding='utf-8') as f:
-                    for ln in lines:
-                        f.write(ln + '\n')
+                _write_lines(path, lines)
                 print('Wrote', path)
                 # record to history when writing
                 try:
@@ -102,55 +176,178 @@ def _run_line_editor(path: str, show_line_numbers: bool = False, history_file: s
         print('unknown command')
 
 
-def _run_curses_editor(path: str, show_line_numbers: bool = False, history_file: str | None = None) -> int:
-    import curses
+def _run_curses_editor(curses, path: str, show_line_numbers: bool = False, history_file: str | None = None) -> int:
+    """Full-screen editor; `curses` is the module, imported once by execute()."""
 
     def _save(buf_lines: List[str], fname: str = None):
-        target = fname or path
-        with open(target, 'w', encoding='utf-8') as f:
-            for ln in buf_lines:
-                f.write(ln + '\n')
+        _write_lines(fname or path, buf_lines)
 
 
     def _main(stdscr):
         curses.curs_set(1)
         stdscr.keypad(True)
-        if os.path.exists(path):
-            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-                buf = [ln.rstrip('\n') for ln in f]
-        else:
+        try:
+            buf = _read_lines(path) or ['']
+        except FileNotFoundError:
             buf = ['']
 
         y = x = 0
         top = 0
         changed = False
 
-        undo_stack: List[List[str]] = []
+        # undo records are small deltas rather than copies of the buffer:
+        #   ('ins_char', idx, x, ch)   ch was inserted at buf[idx][x]
+        #   ('del_char', idx, x, ch)   ch was removed from buf[idx][x]
+        #   ('split', idx, x)          Enter split buf[idx] at x
+        #   ('join', idx, joined_len)  Backspace appended buf[idx] to buf[idx - 1],
+        #                              which was joined_len characters long
+        # the deque drops the oldest record once MAX_UNDO is reached
         MAX_UNDO = 50
+        undo_stack = deque(maxlen=MAX_UNDO)
+        # ('\n'.join(buf), offset of each line in it) for Ctrl-F; every edit
+        # goes through push_undo() or undo(), which drop it, and it is
+        # rebuilt by the next search
+        search_index = None
+
+        def push_undo(rec) -> None:
+            nonlocal search_index
+            search_index = None
+            undo_stack.append(rec)
+
+        def find(query: str):
+            """(line, column) of the first occurrence of `query`, or None."""
+            nonlocal search_index
+            if search_index is None:
+                starts = []
+                pos = 0
+                for ln in buf:
+                    starts.append(pos)
+                    pos += len(ln) + 1
+                search_index = ('\n'.join(buf), starts)
+            joined, starts = search_index
+            pos = joined.find(query)
+            if pos < 0:
+                return None
+            i = bisect_right(starts, pos) - 1
+            return i, pos - starts[i]
+
+        def undo(rec) -> tuple:
+            """Invert one undo record on `buf`; return the (idx, x) to move to."""
+            nonlocal search_index
+            search_index = None
+            op = rec[0]
+            if op == 'ins_char':
+                _, idx, cx, _ch = rec
+                line = buf[idx]
+                buf[idx] = line[:cx] + line[cx + 1:]
+                return idx, cx
+            if op == 'del_char':
+                _, idx, cx, c = rec
+                line = buf[idx]
+                buf[idx] = line[:cx] + c + line[cx:]
+                return idx, cx + 1
+            if op == 'split':
+                _, idx, cx = rec
+                buf[idx] += buf.pop(idx + 1)
+                return idx, cx
+            # 'join'
+            _, idx, joined_len = rec
+            line = buf[idx - 1]
+            buf[idx - 1] = line[:joined_len]
+            buf.insert(idx, line[joined_len:])
+            return idx, 0
+
+        # line-number prefixes, formatted once per line number and reused
+        # on every later draw of that row
+        gutter: List[str] = []
 
-        def push_undo():
-            if len(undo_stack) >= MAX_UNDO:
-                undo_stack.pop(0)
-            undo_stack.append(list(buf))
+        # the line being typed into, held as a list of characters so that
+        # inserting or deleting one doesn't rebuild the whole string; buf
+        # [hot_idx] is stale while it is set, and settle() writes it back
+        hot = None
+        hot_idx = -1
 
+        def settle() -> None:
+            nonlocal hot
+            if hot is not None:
+                buf[hot_idx] = ''.join(hot)
+                hot = None
+
+        def hot_line(idx: int) -> List[str]:
+            nonlocal hot, hot_idx
+            if hot is None or hot_idx != idx:
+                settle()
+                hot = list(buf[idx])
+                hot_idx = idx
+            return hot
+
+        def draw_row(i: int) -> None:
+            stdscr.move(i, 0)
+            stdscr.clrtoeol()
+            idx = top + i
+            if idx >= len(buf):
+                return
+            if show_line_numbers:
+                if idx >= len(gutter):
+                    gutter.extend([f"{n + 1:6d}  " for n in range(len(gutter), idx + 1)])
+                num = gutter[idx]
+                # ensure we don't overflow width
+                avail = max(0, w - len(num) - 1)
+            else:
+                num = ''
+                avail = w - 1
+            if hot is not None and idx == hot_idx:
+                # only the visible part of the hot line is joined
+                text = ''.join(hot[:avail])
+            else:
+                text = buf[idx][:avail]
+            stdscr.addstr(i, 0, num + text)
+
+        h, w = stdscr.getmaxyx()
+        # screen rows whose text changed since the last draw; `full` repaints
+        # every row instead (first draw, scrolling, resize, undo)
+        dirty = set()
+        full = True
+        drawn_top = top
+        # next key, if one was already waiting when the previous one had been
+        # handled; -1 means the input queue was empty
+        ch = -1
         while True:
-            stdscr.clear()
-            h, w = stdscr.getmaxyx()
-            visible = buf[top:top + h - 1]
-            for i, line in enumerate(visible):
-                if show_line_numbers:
-                    num = f"{top + i + 1:6d}  "
-                    # ensure we don't overflow width
-                    avail = max(0, w - len(num) - 1)
-                    stdscr.addstr(i, 0, num + line[:avail])
+            if ch == -1:
+                # draw only once the queued input is used up, so a paste or
+                # key repeat is drawn once rather than after every key
+                if full or top != drawn_top:
+                    stdscr.erase()
+                    rows = range(min(h - 1, len(buf) - top))
                 else:
-                    stdscr.addstr(i, 0, line[:w - 1])
-            status = f"{path} - Ctrl-S save | Ctrl-Q quit | Ln {top + y + 1},Col {x + 1}"
-            stdscr.addstr(h - 1, 0, status[:w - 1], curses.A_REVERSE)
-            stdscr.move(y, x)
-            stdscr.refresh()
-            ch = stdscr.getch()
-            if ch == curses.KEY_DOWN:
+                    rows = sorted(dirty)
+                for i in rows:
+                    draw_row(i)
+                dirty.clear()
+                full = False
+                drawn_top = top
+                status = f"{path} - Ctrl-S save | Ctrl-Q quit | Ln {top + y + 1},Col {x + 1}"
+                stdscr.move(h - 1, 0)
+                stdscr.clrtoeol()
+                stdscr.addstr(h - 1, 0, status[:w - 1], curses.A_REVERSE)
+                stdscr.move(y, x)
+                stdscr.noutrefresh()
+                curses.doupdate()
+                # nothing else to do until a key arrives, so block
+                ch = stdscr.getch()
+            is_backspace = ch in (127, 8, curses.KEY_BACKSPACE)
+            if not ((0 <= ch < 256 and ch not in _COMMAND_KEYS) or (is_backspace and x > 0)):
+                # everything except typing into / deleting within the line
+                # reads buf directly
+                settle()
+            # the cursor's line, looked up once per keypress for the handlers below
+            idx = top + y
+            cur = buf[idx]
+            if ch == curses.KEY_RESIZE:
+                h, w = stdscr.getmaxyx()
+                stdscr.clear()
+                full = True
+            elif ch == curses.KEY_DOWN:
                 if y + top + 1 < len(buf):
                     if y < h - 2:
                         y += 1
@@ -167,20 +364,28 @@ def _run_curses_editor(path: str, show_line_numbers: bool = False, history_file:
                 if x > 0:
                     x -= 1
             elif ch == curses.KEY_RIGHT:
-                if x < len(buf[top + y]):
+                if x < len(cur):
                     x += 1
-            # Backspace: handle several possible codes (127, 8, KEY_BACKSPACE) and curses.ascii.BS
-            elif ch in (127, 8, curses.KEY_BACKSPACE) or (hasattr(curses, 'ascii') and ch == curses.ascii.BS):
-                line = buf[top + y]
+            # Backspace: handle several possible codes (127, 8 == curses.ascii.BS, KEY_BACKSPACE)
+            elif is_backspace:
                 if x > 0:
-                    buf[top + y] = line[:x - 1] + line[x:]
+                    line = hot_line(idx)
+                    push_undo(('del_char', idx, x - 1, line[x - 1]))
+                    del line[x - 1]
                     x -= 1
                     changed = True
-                elif x == 0 and (top + y) > 0:
-                    prev = buf.pop(top + y)
-                    y = max(0, y - 1)
-                    buf[top + y] = buf[top + y] + prev
+                    dirty.add(y)
+                elif idx > 0:
+                    push_undo(('join', idx, len(buf[idx - 1])))
+                    del buf[idx]
+                    if y > 0:
+                        y -= 1
+                    else:
+                        top -= 1
+                    buf[idx - 1] += cur
                     changed = True
+                    # the lines below move up one row
+                    dirty.update(range(y, h - 1))
             elif ch == 19:  # Ctrl-S
                 try:
                     _save(buf)
@@ -193,6 +398,7 @@ def _run_curses_editor(path: str, show_line_numbers: bool = False, history_file:
                 except Exception as e:
                     stdscr.addstr(h - 2, 0, f'Save failed: {e}')
                     stdscr.getch()
+                    dirty.add(h - 2)
             elif ch == 17:  # Ctrl-Q
                 if changed:
                     stdscr.addstr(h - 2, 0, 'Unsaved changes - press Ctrl-Q again to quit without saving')
@@ -200,23 +406,18 @@ def _run_curses_editor(path: str, show_line_numbers: bool = False, history_file:
                     c2 = stdscr.getch()
                     if c2 == 17:
                         return
+                    dirty.add(h - 2)
                 else:
                     return
             elif ch == curses.KEY_ENTER or ch == 10:
-                line = buf[top + y]
-                rest = line[x:]
-                push_undo()
-                buf[top + y] = line[:x]
-                buf.insert(top + y + 1, rest)
+                push_undo(('split', idx, x))
+                buf[idx] = cur[:x]
+                buf.insert(idx + 1, cur[x:])
+                # the lines below move down one row
+                dirty.update(range(y, h - 1))
                 y = min(y + 1, h - 2)
                 x = 0
                 changed = True
-            elif 0 <= ch < 256:
-                push_undo()
-                line = buf[top + y]
-                buf[top + y] = line[:x] + chr(ch) + line[x:]
-                x += 1
-                changed = True
             elif ch == 15:  # Ctrl-O (save as)
                 # prompt for filename in status line
                 curses.echo()
@@ -225,6 +426,7 @@ def _run_curses_editor(path: str, show_line_numbers: bool = False, history_file:
                 stdscr.refresh()
                 fname = stdscr.getstr(h - 2, 9, 200).decode(errors='ignore')
                 curses.noecho()
+                dirty.add(h - 2)
                 if fname:
                     try:
                         _save(buf, fname)
@@ -241,30 +443,43 @@ def _run_curses_editor(path: str, show_line_numbers: bool = False, history_file:
                 stdscr.refresh()
                 query = stdscr.getstr(h - 2, 8, 200).decode(errors='ignore')
                 curses.noecho()
+                dirty.add(h - 2)
                 if query:
-                    found = False
-                    for i, ln in enumerate(buf):
-                        if query in ln:
-                            # jump to first match
-                            if i >= top + h - 1:
-                                top = max(0, i - (h // 2))
-                                y = i - top
-                            else:
-                                y = i - top
-                            x = ln.find(query)
-                            found = True
-                            break
-                    if not found:
+                    match = find(query)
+                    if match is not None:
+                        # jump to first match
+                        i, x = match
+                        if not top <= i < top + h - 1:
+                            top = max(0, i - (h // 2))
+                        y = i - top
+                    else:
                         stdscr.addstr(h - 2, 0, f'Not found: {query}')
                         stdscr.getch()
             elif ch == 21:  # Ctrl-U undo
                 if undo_stack:
-                    last = undo_stack.pop()
-                    buf[:] = last
+                    idx, x = undo(undo_stack.pop())
+                    # bring the undone line back into view
+                    if not top <= idx < top + h - 1:
+                        top = max(0, idx - (h // 2))
+                    y = idx - top
                     changed = True
+                    full = True
+            elif 0 <= ch < 256:
+                # after the control keys above so they aren't inserted as text
+                c = chr(ch)
+                push_undo(('ins_char', idx, x, c))
+                hot_line(idx).insert(x, c)
+                x += 1
+                changed = True
+                dirty.add(y)
+
+            # peek for a key that is already queued; prompts inside the
+            # handlers above need the default blocking getch()
+            stdscr.timeout(0)
+            ch = stdscr.getch()
+            stdscr.timeout(-1)
 
     try:
-        import curses
         curses.wrapper(_main)
         return 0
     except Exception as e:
@@ -272,12 +487,15 @@ def _run_curses_editor(path: str, show_line_numbers: bool = False, history_file:
         return 1
 
 
+# built once per process and reused by every execute() call
+_PARSER = argparse.ArgumentParser(prog='nano')
+_PARSER.add_argument('file', nargs='?', help='file to edit')
+_PARSER.add_argument('--line-numbers', action='store_true', help='show line numbers (gutter)')
+_PARSER.add_argument('--history-file', help='path to history file to record saves (default ~/.wilx_history)')
+
+
 def execute(argv: List[str]) -> int:
-    parser = argparse.ArgumentParser(prog='nano')
-    parser.add_argument('file', nargs='?', help='file to edit')
-    parser.add_argument('--line-numbers', action='store_true', help='show line numbers (gutter)')
-    parser.add_argument('--history-file', help='path to history file to record saves (default ~/.wilx_history)')
-    ns = parser.parse_args(argv)
+    ns = _PARSER.parse_args(argv)
     path = ns.file or 'untitled.txt'
 
     history_file = ns.history_file or os.path.expanduser('~/.wilx_history')
@@ -285,9 +503,15 @@ def execute(argv: List[str]) -> int:
     # Try curses editor first, fallback to line editor
     try:
         import curses
-        return _run_curses_editor(path, show_line_numbers=ns.line_numbers, history_file=history_file)
-    except Exception:
+    except ImportError:
+        curses = None
+    try:
+        if curses is not None:
+            return _run_curses_editor(curses, path, show_line_numbers=ns.line_numbers, history_file=history_file)
         return _run_line_editor(path, show_line_numbers=ns.line_numbers, history_file=history_file)
+    finally:
+        # saves made during the session are recorded in one write at exit
+        _flush_history()
 
 
 if __name__ == '__main__':
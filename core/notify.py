@@ -14,7 +14,7 @@ from __future__ import annotations
 import os
 import sys
 import argparse
-from typing import List
+from typing import Dict, List, Optional
 
 if os.name == 'nt':
     try:
@@ -29,11 +29,38 @@ if os.name == 'nt':
             from ctypes import wintypes
         except ImportError:
             ctypes = None
+    if not has_toast and ctypes:
+        # prototype set once; a private WinDLL keeps these argtypes from
+        # leaking into other users of ctypes.windll.user32
+        _user32 = ctypes.WinDLL('user32', use_last_error=True)
+        _MessageBoxW = _user32.MessageBoxW
+        _MessageBoxW.argtypes = [wintypes.HWND, wintypes.LPCWSTR, wintypes.LPCWSTR, wintypes.UINT]
+        _MessageBoxW.restype = ctypes.c_int
 else:
     has_toast = False
     ctypes = None
 
 
+# absolute icon path -> itself if the file exists, else None; `notify` runs
+# repeatedly inside the shell, usually with the same icon
+_ICON_CACHE: Dict[str, Optional[str]] = {}
+
+
+def _resolve_icon(icon_path: Optional[str]) -> Optional[str]:
+    """Absolute path of an existing icon file, checked once per path."""
+    if not icon_path:
+        return None
+    # keyed by the absolute path so a later `cd` can't reuse a stale answer
+    icon_path = os.path.abspath(icon_path)
+    try:
+        return _ICON_CACHE[icon_path]
+    except KeyError:
+        pass
+    resolved = icon_path if os.path.isfile(icon_path) else None
+    _ICON_CACHE[icon_path] = resolved
+    return resolved
+
+
 def _send_notification(title: str, message: str, icon_path: str = None) -> bool:
     """Send a Windows toast notification. Returns True on success."""
     if os.name != 'nt':
@@ -44,8 +71,9 @@ def _send_notification(title: str, message: str, icon_path: str = None) -> bool:
         try:
             toaster = ToastNotifier()
             duration = 5  # seconds
-            if icon_path and os.path.exists(icon_path):
-                toaster.show_toast(title, message, icon_path=icon_path, duration=duration)
+            icon = _resolve_icon(icon_path)
+            if icon:
+                toaster.show_toast(title, message, icon_path=icon, duration=duration)
             else:
                 toaster.show_toast(title, message, duration=duration)
             return True
@@ -58,15 +86,10 @@ def _send_notification(title: str, message: str, icon_path: str = None) -> bool:
         try:
             # Windows 10+ toast notification via COM
             # Simplified: We'll use a basic message box for now
-            user32 = ctypes.windll.user32
             # MB_OK = 0x00000000
             # MB_ICONINFORMATION = 0x00000040
-            result = user32.MessageBoxW(
-                0,
-                message.encode('utf-16le') if isinstance(message, str) else message,
-                title.encode('utf-16le') if isinstance(title, str) else title,
-                0x00000040  # MB_ICONINFORMATION
-            )
+            # str arguments are passed as LPCWSTR by the prototype
+            result = _MessageBoxW(None, message, title, 0x00000040)  # MB_ICONINFORMATION
             return result != 0
         except Exception as e:
             print(f'notify: Failed to send notification: {e}', file=sys.stderr)
@@ -78,24 +101,30 @@ def _send_notification(title: str, message: str, icon_path: str = None) -> bool:
         return False
 
 
+# built once per process; the shell reuses imported command modules, so
+# repeated `notify` calls only pay for parse_args()
+_PARSER = argparse.ArgumentParser(prog='notify', add_help=False)
+_PARSER.add_argument('action', choices=['send'], nargs='?', help='Action to perform')
+_PARSER.add_argument('message', nargs='*', help='Notification message')
+_PARSER.add_argument('--title', '-t', default='Wilx', help='Notification title')
+_PARSER.add_argument('--icon', '-i', help='Icon path (.ico file)')
+_PARSER.add_argument('-h', '--help', action='store_true', dest='show_help')
+
+_EXAMPLES = """
+Examples:
+  notify send "Backup complete"
+  notify send --title "Alert" "Task finished"
+  notify send --icon icon.ico "Message with icon"
+  backup && notify send "Backup successful"
+"""
+
+
 def execute(args: List[str]) -> int:
     """Execute the notify command."""
-    parser = argparse.ArgumentParser(prog='notify', add_help=False)
-    parser.add_argument('action', choices=['send'], nargs='?', help='Action to perform')
-    parser.add_argument('message', nargs='*', help='Notification message')
-    parser.add_argument('--title', '-t', default='Wilx', help='Notification title')
-    parser.add_argument('--icon', '-i', help='Icon path (.ico file)')
-    parser.add_argument('-h', '--help', action='store_true', dest='show_help')
-
-    ns = parser.parse_args(args)
+    ns = _PARSER.parse_args(args)
     if ns.show_help or not ns.action:
-        parser.print_help()
-        print()
-        print('Examples:')
-        print('  notify send "Backup complete"')
-        print('  notify send --title "Alert" "Task finished"')
-        print('  notify send --icon icon.ico "Message with icon"')
-        print('  backup && notify send "Backup successful"')
+        # usage and examples in one write
+        sys.stdout.write(_PARSER.format_help() + _EXAMPLES)
         return 0
 
     if ns.action == 'send':
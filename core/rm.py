@@ -6,59 +6,160 @@ Usage: rm [-f] [-r] PATH...
 from __future__ import annotations
 
 import os
-import shutil
-import argparse
+import stat
 import sys
 from typing import List
 
+from utils.helpers import parse_flags
+
+
+_IS_WINDOWS = os.name == 'nt'
+# most paths removed concurrently by `rm -r a b c ...`
+_MAX_WORKERS = 8
+
+
+def _is_tree_dir(entry: os.DirEntry) -> bool:
+    """True for a directory to descend into (not a symlink or junction)."""
+    if not entry.is_dir(follow_symlinks=False):
+        return False
+    if _IS_WINDOWS:
+        # junctions and other reparse points are unlinked, never followed;
+        # on Windows this stat comes from the directory listing itself
+        attrs = entry.stat(follow_symlinks=False).st_file_attributes
+        return not attrs & stat.FILE_ATTRIBUTE_REPARSE_POINT
+    return True
+
+
+def _fast_rmtree(path: str) -> None:
+    """Remove the directory tree at `path`, like shutil.rmtree().
+
+    Walks with os.scandir and an explicit stack, so the file type comes from
+    the DirEntry instead of an lstat per entry. Directories are removed
+    after everything found inside them, deepest first.
+    """
+    dirs = [path]
+    stack = [path]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if _is_tree_dir(entry):
+                    stack.append(entry.path)
+                    dirs.append(entry.path)
+                else:
+                    os.unlink(entry.path)
+    # a directory is always listed after its parent
+    for d in reversed(dirs):
+        os.rmdir(d)
+
+
+def _remove(p: str, recursive: bool, dry_run: bool) -> None:
+    # one lstat decides the branch: symlinks (and Windows junctions) to
+    # directories are removed as links, never descended into
+    st = os.lstat(p)
+    is_dir = stat.S_ISDIR(st.st_mode)
+    if is_dir and _IS_WINDOWS and st.st_file_attributes & stat.FILE_ATTRIBUTE_REPARSE_POINT:
+        is_dir = False
+    if is_dir:
+        if recursive:
+            action = f"rmtree '{p}'"
+            if dry_run:
+                print(action)
+            else:
+                _fast_rmtree(p)
+        else:
+            action = f"rmdir '{p}'"
+            if dry_run:
+                print(action)
+            else:
+                os.rmdir(p)
+    else:
+        action = f"remove '{p}'"
+        if dry_run:
+            print(action)
+        else:
+            os.remove(p)
+
+
+def _report(p: str, e: Exception, force: bool) -> int:
+    """Print the error for removing `p`; return the exit code it implies."""
+    if isinstance(e, FileNotFoundError):
+        if force:
+            return 0
+        print(f"rm: cannot remove '{p}': No such file or directory", file=sys.stderr)
+    elif isinstance(e, IsADirectoryError):
+        print(f"rm: cannot remove '{p}': Is a directory", file=sys.stderr)
+    elif isinstance(e, PermissionError):
+        print(f"rm: cannot remove '{p}': Permission denied", file=sys.stderr)
+    else:
+        print(f"rm: error removing '{p}': {e}", file=sys.stderr)
+    return 1
+
+
+def _independent(paths: List[str]) -> bool:
+    """True if no path repeats or lies inside another one."""
+    seen = set()
+    for p in paths:
+        a = os.path.normcase(os.path.abspath(p))
+        if a in seen:
+            return False
+        seen.add(a)
+    for a in seen:
+        parent = os.path.dirname(a)
+        while parent != a:
+            if parent in seen:
+                return False
+            a, parent = parent, os.path.dirname(parent)
+    return True
+
+
+_FLAGS = {
+    '-r': 'recursive', '--recursive': 'recursive',
+    '-f': 'force', '--force': 'force',
+    '--dry-run': 'dry_run',
+    '-h': 'show_help', '--help': 'show_help',
+}
+
+
+def _parser():
+    import argparse
 
-def execute(args: List[str]) -> int:
     parser = argparse.ArgumentParser(prog='rm', add_help=False)
     parser.add_argument('-r', '--recursive', action='store_true', help='remove directories and their contents recursively')
     parser.add_argument('-f', '--force', action='store_true', help='ignore nonexistent files and arguments, never prompt')
     parser.add_argument('--dry-run', action='store_true', help="show what would be done, but don't actually remove files")
     parser.add_argument('paths', nargs='+')
     parser.add_argument('-h', '--help', action='store_true', dest='show_help')
+    return parser
 
-    ns = parser.parse_args(args)
+
+def execute(args: List[str]) -> int:
+    ns = parse_flags(args, _FLAGS, 'paths', _parser)
     if ns.show_help:
-        parser.print_help()
+        _parser().print_help()
         return 0
 
+    paths = ns.paths
+    if not paths:
+        print('rm: missing operand', file=sys.stderr)
+        return 2
     rc = 0
-    for p in ns.paths:
+    if ns.recursive and not ns.dry_run and len(paths) > 1 and _independent(paths):
+        # separate trees: remove them concurrently so their syscalls overlap,
+        # then report errors in argument order
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(paths))) as pool:
+            futures = [pool.submit(_remove, p, True, False) for p in paths]
+        for p, fut in zip(paths, futures):
+            e = fut.exception()
+            if e is not None:
+                rc |= _report(p, e, ns.force)
+        return rc
+
+    for p in paths:
         try:
-            if os.path.isdir(p) and not os.path.islink(p):
-                if ns.recursive:
-                    action = f"rmtree '{p}'"
-                    if ns.dry_run:
-                        print(action)
-                    else:
-                        shutil.rmtree(p)
-                else:
-                    action = f"rmdir '{p}'"
-                    if ns.dry_run:
-                        print(action)
-                    else:
-                        os.rmdir(p)
-            else:
-                action = f"remove '{p}'"
-                if ns.dry_run:
-                    print(action)
-                else:
-                    os.remove(p)
-        except FileNotFoundError:
-            if not ns.force:
-                print(f"rm: cannot remove '{p}': No such file or directory", file=sys.stderr)
-                rc = 1
-        except IsADirectoryError:
-            print(f"rm: cannot remove '{p}': Is a directory", file=sys.stderr)
-            rc = 1
-        except PermissionError:
-            print(f"rm: cannot remove '{p}': Permission denied", file=sys.stderr)
-            rc = 1
+            _remove(p, ns.recursive, ns.dry_run)
         except Exception as e:
-            print(f"rm: error removing '{p}': {e}", file=sys.stderr)
-            rc = 1
+            rc |= _report(p, e, ns.force)
 
     return rc
@@ -17,7 +17,9 @@ import sys
 import argparse
 from typing import List
 
-if os.name == 'nt':
+_IS_WINDOWS = os.name == 'nt'
+
+if _IS_WINDOWS:
     try:
         # Use Windows Search API via COM
         import win32com.client  # type: ignore
@@ -34,13 +36,17 @@ else:
     ctypes = None
 
 
+# locations the basic file search falls back to, expanded once at import
+_COMMON_PATHS = tuple(os.path.expanduser(p) for p in (
+    '~\\Documents',
+    '~\\Downloads',
+    '~\\Desktop',
+))
+
+
 def _search_index_file(filename: str) -> List[str]:
     """Search for files by name using Windows Search Index."""
     results = []
-    if os.name != 'nt':
-        print('search: Windows-only feature', file=sys.stderr)
-        return results
-
     try:
         # Method 1: Use Windows Search COM API (if available)
         if win32com:
@@ -60,21 +66,29 @@ def _search_index_file(filename: str) -> List[str]:
         print('search: Falling back to basic file search...', file=sys.stderr)
         
         # Basic fallback: search common indexed locations
-        common_paths = [
-            os.path.expanduser('~\\Documents'),
-            os.path.expanduser('~\\Downloads'),
-            os.path.expanduser('~\\Desktop'),
-        ]
-        
-        for root in common_paths:
-            if os.path.exists(root):
-                for dirpath, dirnames, filenames in os.walk(root):
-                    for fname in filenames:
-                        if filename.lower() in fname.lower():
-                            full_path = os.path.join(dirpath, fname)
-                            results.append(full_path)
-                            if len(results) >= 20:  # Limit results
-                                return results
+        needle = filename.casefold()
+        for root in _COMMON_PATHS:
+            if not os.path.isdir(root):
+                continue
+            # same top-down order as os.walk(), but matching straight off the
+            # DirEntry; symlinked directories are neither matched nor followed
+            stack = [root]
+            while stack:
+                subdirs = []
+                try:
+                    with os.scandir(stack.pop()) as it:
+                        for entry in it:
+                            if entry.is_dir():
+                                if not entry.is_symlink():
+                                    subdirs.append(entry.path)
+                            elif needle in entry.name.casefold():
+                                results.append(entry.path)
+                                if len(results) >= 20:  # Limit results
+                                    return results
+                except OSError:
+                    # unreadable directory: skipped, as os.walk does
+                    continue
+                stack.extend(reversed(subdirs))
     except Exception as e:
         print(f'search: Error during search: {e}', file=sys.stderr)
     
@@ -84,10 +98,6 @@ def _search_index_file(filename: str) -> List[str]:
 def _search_index_content(query: str, location: str = None) -> List[str]:
     """Search for files containing specific content using Windows Search Index."""
     results = []
-    if os.name != 'nt':
-        print('search: Windows-only feature', file=sys.stderr)
-        return results
-
     print('search: Full-text content search requires Windows Search COM API', file=sys.stderr)
     print('search: This feature requires additional setup', file=sys.stderr)
     return results
@@ -96,39 +106,50 @@ def _search_index_content(query: str, location: str = None) -> List[str]:
 def _search_index_query(keyword: str, location: str = None) -> List[str]:
     """General keyword search using Windows Search Index."""
     results = []
-    if os.name != 'nt':
-        print('search: Windows-only feature', file=sys.stderr)
-        return results
-
     # Try to use Windows Search query
     print('search: Windows Search Index query requires COM API', file=sys.stderr)
     print('search: Basic implementation coming soon', file=sys.stderr)
     return results
 
 
-def execute(args: List[str]) -> int:
-    """Execute the search command."""
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog='search', add_help=False)
     subparsers = parser.add_subparsers(dest='mode', help='Search mode')
-    
+
     index_parser = subparsers.add_parser('index', help='Use Windows Search Index')
     index_parser.add_argument('type', choices=['file', 'content', 'query'], help='Search type')
     index_parser.add_argument('query', help='Search query')
     index_parser.add_argument('--location', '-l', help='Limit search to location')
-    
+
     parser.add_argument('-h', '--help', action='store_true', dest='show_help')
-    
-    ns = parser.parse_args(args)
+    return parser
+
+
+# parser and subparsers are built once per process, not on every call
+_PARSER = _build_parser()
+
+_EXAMPLES = """
+Examples:
+  search index file "report.pdf"
+  search index content "meeting notes"
+  search index query "keyword"
+  search index file "*.py" --location C:\\Users
+"""
+
+
+def execute(args: List[str]) -> int:
+    """Execute the search command."""
+    ns = _PARSER.parse_args(args)
     if ns.show_help or not ns.mode:
-        parser.print_help()
-        print()
-        print('Examples:')
-        print('  search index file "report.pdf"')
-        print('  search index content "meeting notes"')
-        print('  search index query "keyword"')
-        print('  search index file "*.py" --location C:\\Users')
+        # usage and examples in one write
+        sys.stdout.write(_PARSER.format_help() + _EXAMPLES)
         return 0
 
+    if not _IS_WINDOWS:
+        # every search mode is backed by Windows Search
+        print('search: Windows-only feature', file=sys.stderr)
+        return 1
+
     if ns.mode == 'index':
         if ns.type == 'file':
             results = _search_index_file(ns.query)
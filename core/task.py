@@ -16,9 +16,32 @@ import os
 import sys
 import argparse
 import subprocess
+import time
 from typing import List
 import re
 
+_IS_WIN = os.name == 'nt'
+
+# all schedule formats understood by _parse_schedule, as one alternation
+# so a parse is a single match; the taken branch is m.lastgroup
+_SCHEDULE_RE = re.compile(
+    r'(?P<daily>daily\s+(?P<dh>\d+)(?P<dp>am|pm))'
+    r'|(?P<weekly>weekly\s+(?P<wd>\w+)\s+(?P<wh>\d+)(?P<wp>am|pm))'
+    r'|(?P<monthly>monthly\s+(?P<md>\d+)(?:st|nd|rd|th)\s+(?P<mh>\d+)(?P<mp>am|pm))'
+    r'|(?P<time>(?P<th>\d{1,2}):(?P<tm>\d{2}))'
+)
+
+# 12-hour clock (hour, period) -> 24-hour hour
+_HOUR24 = {(h, 'am'): 0 if h == 12 else h for h in range(1, 13)}
+_HOUR24.update({(h, 'pm'): h if h == 12 else h + 12 for h in range(1, 13)})
+
+
+def _mk_time(hour: int, period: str) -> str:
+    """Format a 12-hour clock time as HH:00 for schtasks /ST."""
+    # out-of-range hours keep the old arithmetic: pm adds 12, am is as-is
+    hour = _HOUR24.get((hour, period), hour + 12 if period == 'pm' else hour)
+    return f'{hour:02d}:00'
+
 
 def _parse_schedule(schedule_str: str) -> dict:
     """Parse human-readable schedule string into task scheduler format.
@@ -29,170 +52,268 @@ def _parse_schedule(schedule_str: str) -> dict:
       "monthly 1st 1am" -> monthly on 1st at 1am
     """
     schedule = {}
-    schedule_str = schedule_str.lower().strip()
-    
-    # Daily
-    daily_match = re.match(r'daily\s+(\d+)(am|pm)', schedule_str)
-    if daily_match:
-        hour = int(daily_match.group(1))
-        period = daily_match.group(2)
-        if period == 'pm' and hour != 12:
-            hour += 12
-        elif period == 'am' and hour == 12:
-            hour = 0
+    m = _SCHEDULE_RE.match(schedule_str.lower().strip())
+    kind = m.lastgroup if m else None
+
+    if kind == 'daily':
         schedule['type'] = 'daily'
-        schedule['time'] = f'{hour:02d}:00'
+        schedule['time'] = _mk_time(int(m.group('dh')), m.group('dp'))
         return schedule
-    
-    # Weekly
-    weekly_match = re.match(r'weekly\s+(\w+)\s+(\d+)(am|pm)', schedule_str)
-    if weekly_match:
-        day = weekly_match.group(1)
-        hour = int(weekly_match.group(2))
-        period = weekly_match.group(3)
-        if period == 'pm' and hour != 12:
-            hour += 12
-        elif period == 'am' and hour == 12:
-            hour = 0
+
+    if kind == 'weekly':
         schedule['type'] = 'weekly'
-        schedule['day'] = day
-        schedule['time'] = f'{hour:02d}:00'
+        schedule['day'] = m.group('wd')
+        schedule['time'] = _mk_time(int(m.group('wh')), m.group('wp'))
         return schedule
-    
-    # Monthly
-    monthly_match = re.match(r'monthly\s+(\d+)(st|nd|rd|th)\s+(\d+)(am|pm)', schedule_str)
-    if monthly_match:
-        day_num = int(monthly_match.group(1))
-        hour = int(monthly_match.group(3))
-        period = monthly_match.group(4)
-        if period == 'pm' and hour != 12:
-            hour += 12
-        elif period == 'am' and hour == 12:
-            hour = 0
+
+    if kind == 'monthly':
         schedule['type'] = 'monthly'
-        schedule['day'] = day_num
-        schedule['time'] = f'{hour:02d}:00'
+        schedule['day'] = int(m.group('md'))
+        schedule['time'] = _mk_time(int(m.group('mh')), m.group('mp'))
         return schedule
-    
+
     # Simple time format: HH:MM
-    time_match = re.match(r'(\d{1,2}):(\d{2})', schedule_str)
-    if time_match:
-        hour = int(time_match.group(1))
-        minute = int(time_match.group(2))
+    if kind == 'time':
+        hour = int(m.group('th'))
+        minute = int(m.group('tm'))
         schedule['type'] = 'daily'
         schedule['time'] = f'{hour:02d}:{minute:02d}'
         return schedule
-    
+
     # Default: daily at specified time
     return {'type': 'daily', 'time': '00:00'}
 
 
+# Task Scheduler 2.0 constants (taskschd.h)
+_TASK_TRIGGER = {'daily': 2, 'weekly': 3, 'monthly': 4}
+_TASK_ACTION_EXEC = 0
+_TASK_CREATE_OR_UPDATE = 6
+_TASK_LOGON_INTERACTIVE_TOKEN = 3
+# weekday names accepted by "weekly <day> ..." -> schtasks /D values
+_DAY_MAP = {
+    'sunday': 'SU', 'monday': 'MO', 'tuesday': 'TU',
+    'wednesday': 'WE', 'thursday': 'TH', 'friday': 'FR', 'saturday': 'SA'
+}
+# COM DaysOfWeek bits, Sunday first (the order of _DAY_MAP)
+_COM_WEEKDAYS = {d: 1 << i for i, d in enumerate(_DAY_MAP)}
+
+# connected Schedule.Service, None before the first attempt, False if
+# pywin32 or the service is unavailable
+_TASK_SERVICE = None
+
+
+def _task_service():
+    """Return a connected Schedule.Service object, or None to use schtasks."""
+    global _TASK_SERVICE
+    if _TASK_SERVICE is None:
+        try:
+            # Task Scheduler COM API; avoids spawning schtasks.exe per call.
+            # Imported here so loading this module (help, man, docs) doesn't
+            # pull in pywin32's COM layer
+            import win32com.client  # type: ignore
+
+            svc = win32com.client.Dispatch('Schedule.Service')
+            svc.Connect()
+        except Exception:
+            # no pywin32 (ImportError) or no service: fall back to schtasks
+            svc = False
+        _TASK_SERVICE = svc
+    # `is` test: truth-testing a COM object would call into it
+    return None if _TASK_SERVICE is False else _TASK_SERVICE
+
+
+def _split_command(command: str):
+    """Split a /TR style command line into (program, arguments)."""
+    command = command.strip()
+    if command.startswith('"'):
+        end = command.find('"', 1)
+        if end > 0:
+            return command[1:end], command[end + 1:].lstrip()
+    prog, _, rest = command.partition(' ')
+    return prog, rest.lstrip()
+
+
+def _com_schedule(svc, task_name: str, command: str, schedule: dict) -> None:
+    """Register `command` under `task_name` the way schtasks /Create /F would."""
+    td = svc.NewTask(0)
+    kind = schedule['type']
+    trigger = td.Triggers.Create(_TASK_TRIGGER.get(kind, 2))
+    # schtasks defaults the start date to today
+    trigger.StartBoundary = f"{time.strftime('%Y-%m-%d')}T{schedule['time']}:00"
+    if kind == 'weekly':
+        trigger.DaysOfWeek = _COM_WEEKDAYS.get(schedule.get('day', ''), 1)
+        trigger.WeeksInterval = 1
+    elif kind == 'monthly':
+        trigger.DaysOfMonth = 1 << (int(schedule.get('day', 1)) - 1)
+        trigger.MonthsOfYear = 0xFFF
+    else:
+        trigger.DaysInterval = 1
+
+    action = td.Actions.Create(_TASK_ACTION_EXEC)
+    action.Path, action.Arguments = _split_command(command)
+
+    svc.GetFolder('\\').RegisterTaskDefinition(
+        task_name, td, _TASK_CREATE_OR_UPDATE, None, None,
+        _TASK_LOGON_INTERACTIVE_TOKEN)
+
+
+def _decode(raw: bytes) -> str:
+    """Decode schtasks output the way text=True would have on Windows."""
+    return raw.decode('mbcs', 'replace').replace('\r\n', '\n')
+
+
+def _windows_only() -> bool:
+    print('task: Windows-only feature', file=sys.stderr)
+    return False
+
+
+def _schtasks(args: List[str], what: str):
+    """Run schtasks.exe with `args`; return its stdout, or None on failure.
+
+    Failures are reported as "task: Failed to <what>: <stderr>", and errors
+    starting the process as "task: Error: <exc>".
+    """
+    try:
+        result = subprocess.run(['schtasks', *args], capture_output=True, check=False)
+    except Exception as e:
+        print(f'task: Error: {e}', file=sys.stderr)
+        return None
+    if result.returncode != 0:
+        print(f'task: Failed to {what}: {_decode(result.stderr).strip()}', file=sys.stderr)
+        return None
+    return result.stdout
+
+
 def _schedule_task(name: str, command: str, schedule_str: str, tag: str = "user") -> bool:
     """Schedule a task using Windows Task Scheduler with tag prefix."""
-    if os.name != 'nt':
-        print('task: Windows-only feature', file=sys.stderr)
-        return False
+    if not _IS_WIN:
+        return _windows_only()
 
     schedule = _parse_schedule(schedule_str)
     task_name = f"{tag}_{name}"  # prefix tag to task name
 
-    try:
-        cmd_parts = ['schtasks', '/Create', '/TN', task_name, '/TR', command, '/SC']
-
-        if schedule['type'] == 'daily':
-            cmd_parts.extend(['DAILY', '/ST', schedule['time']])
-        elif schedule['type'] == 'weekly':
-            day_map = {
-                'sunday': 'SU', 'monday': 'MO', 'tuesday': 'TU',
-                'wednesday': 'WE', 'thursday': 'TH', 'friday': 'FR', 'saturday': 'SA'
-            }
-            day_abbr = day_map.get(schedule.get('day', '').lower(), 'SU')
-            cmd_parts.extend(['WEEKLY', '/D', day_abbr, '/ST', schedule['time']])
-        elif schedule['type'] == 'monthly':
-            cmd_parts.extend(['MONTHLY', '/D', str(schedule.get('day', 1)), '/ST', schedule['time']])
-        else:
-            cmd_parts.extend(['DAILY', '/ST', schedule['time']])
-
-        # Force creation if it already exists
-        cmd_parts.append('/F')
-
-        result = subprocess.run(cmd_parts, capture_output=True, text=True, check=False)
-        if result.returncode == 0:
-            print(f'task: Scheduled task "{task_name}" successfully')
-            return True
-        else:
-            print(f'task: Failed to schedule task: {result.stderr.strip()}', file=sys.stderr)
+    svc = _task_service()
+    if svc is not None:
+        try:
+            _com_schedule(svc, task_name, command, schedule)
+        except Exception as e:
+            print(f'task: Failed to schedule task: {e}', file=sys.stderr)
             return False
-    except Exception as e:
-        print(f'task: Error scheduling task: {e}', file=sys.stderr)
+        print(f'task: Scheduled task "{task_name}" successfully')
+        return True
+
+    cmd_parts = ['/Create', '/TN', task_name, '/TR', command, '/SC']
+
+    if schedule['type'] == 'daily':
+        cmd_parts.extend(['DAILY', '/ST', schedule['time']])
+    elif schedule['type'] == 'weekly':
+        # _parse_schedule has already lowercased the day name
+        day_abbr = _DAY_MAP.get(schedule.get('day', ''), 'SU')
+        cmd_parts.extend(['WEEKLY', '/D', day_abbr, '/ST', schedule['time']])
+    elif schedule['type'] == 'monthly':
+        cmd_parts.extend(['MONTHLY', '/D', str(schedule.get('day', 1)), '/ST', schedule['time']])
+    else:
+        cmd_parts.extend(['DAILY', '/ST', schedule['time']])
+
+    # Force creation if it already exists
+    cmd_parts.append('/F')
+
+    if _schtasks(cmd_parts, 'schedule task') is None:
         return False
+    print(f'task: Scheduled task "{task_name}" successfully')
+    return True
 
 
 def _list_tasks(tag: str = "user") -> bool:
     """List only tasks created with a specific tag prefix."""
-    if os.name != 'nt':
-        print('task: Windows-only feature', file=sys.stderr)
-        return False
-
-    try:
-        result = subprocess.run(['schtasks', '/Query', '/FO', 'LIST'],
-                                capture_output=True, text=True, check=False)
-        if result.returncode != 0:
-            print(f'task: Failed to list tasks: {result.stderr}', file=sys.stderr)
+    if not _IS_WIN:
+        return _windows_only()
+
+    svc = _task_service()
+    if svc is not None:
+        try:
+            tasks = svc.GetFolder('\\').GetTasks(0)
+            print(f"Tasks tagged with '{tag}':\n")
+            for t in tasks:
+                if t.Name.startswith(f"{tag}_"):
+                    print(f"TaskName: {t.Path}")
+            return True
+        except Exception as e:
+            print(f'task: Failed to list tasks: {e}', file=sys.stderr)
             return False
 
-        print(f"Tasks tagged with '{tag}':\n")
-        for line in result.stdout.splitlines():
-            if line.startswith("TaskName:") and f"\\{tag}_" in line:
-                print(line)
-        return True
-    except Exception as e:
-        print(f'task: Error listing tasks: {e}', file=sys.stderr)
+    out = _schtasks(['/Query', '/FO', 'LIST'], 'list tasks')
+    if out is None:
         return False
 
+    print(f"Tasks tagged with '{tag}':\n")
+    # filter the raw bytes and decode only the lines that are printed
+    needle = f"\\{tag}_".encode('mbcs', 'replace')
+    for line in out.splitlines():
+        if line.startswith(b"TaskName:") and needle in line:
+            print(_decode(line))
+    return True
+
 
 def _remove_task(name: str) -> bool:
     """Remove a scheduled task."""
-    if os.name != 'nt':
-        print('task: Windows-only feature', file=sys.stderr)
-        return False
-    
-    try:
-        result = subprocess.run(['schtasks', '/Delete', '/TN', name, '/F'],
-                              capture_output=True, text=True, check=False)
-        if result.returncode == 0:
-            print(f'task: Removed task "{name}"')
-            return True
-        else:
-            print(f'task: Failed to remove task: {result.stderr}', file=sys.stderr)
+    if not _IS_WIN:
+        return _windows_only()
+
+    svc = _task_service()
+    if svc is not None:
+        try:
+            svc.GetFolder('\\').DeleteTask(name, 0)
+        except Exception as e:
+            print(f'task: Failed to remove task: {e}', file=sys.stderr)
             return False
-    except Exception as e:
-        print(f'task: Error removing task: {e}', file=sys.stderr)
+        print(f'task: Removed task "{name}"')
+        return True
+
+    if _schtasks(['/Delete', '/TN', name, '/F'], 'remove task') is None:
         return False
+    print(f'task: Removed task "{name}"')
+    return True
 
 
 def _run_task(name: str) -> bool:
     """Run a scheduled task immediately."""
-    if os.name != 'nt':
-        print('task: Windows-only feature', file=sys.stderr)
-        return False
-    
-    try:
-        result = subprocess.run(['schtasks', '/Run', '/TN', name],
-                              capture_output=True, text=True, check=False)
-        if result.returncode == 0:
-            print(f'task: Running task "{name}"')
-            return True
-        else:
-            print(f'task: Failed to run task: {result.stderr}', file=sys.stderr)
+    if not _IS_WIN:
+        return _windows_only()
+
+    svc = _task_service()
+    if svc is not None:
+        try:
+            svc.GetFolder('\\').GetTask(name).Run(None)
+        except Exception as e:
+            print(f'task: Failed to run task: {e}', file=sys.stderr)
             return False
-    except Exception as e:
-        print(f'task: Error running task: {e}', file=sys.stderr)
+        print(f'task: Running task "{name}"')
+        return True
+
+    if _schtasks(['/Run', '/TN', name], 'run task') is None:
         return False
+    print(f'task: Running task "{name}"')
+    return True
 
 
-def execute(args: List[str]) -> int:
-    """Execute the task command."""
+# `task schedule <action>` handlers; argparse has already enforced each
+# action's positionals and set its defaults (e.g. --tag)
+_ACTIONS = {
+    'add': lambda ns: _schedule_task(ns.name, ns.command, ns.schedule, ns.tag),
+    'list': lambda ns: _list_tasks(ns.tag),
+    'remove': lambda ns: _remove_task(ns.name),
+    'run': lambda ns: _run_task(ns.name),
+}
+
+# built on first use and reused by every later execute() call
+_PARSER = None
+
+
+def _get_parser() -> argparse.ArgumentParser:
+    global _PARSER
+    if _PARSER is not None:
+        return _PARSER
     parser = argparse.ArgumentParser(prog='task', add_help=False)
     subparsers = parser.add_subparsers(dest='mode', help='Task mode')
 
@@ -206,6 +327,10 @@ def execute(args: List[str]) -> int:
     add_parser.add_argument('schedule', help='Schedule (e.g., "daily 2am", "weekly sunday 3am")')
     add_parser.add_argument('--tag', default='user', help='Optional tag prefix for your tasks')
 
+    # ---- LIST ----
+    list_parser = schedule_subparsers.add_parser('list', help='List tagged tasks')
+    list_parser.add_argument('--tag', default='user', help='Tag prefix to list')
+
     # ---- REMOVE ----
     remove_parser = schedule_subparsers.add_parser('remove', help='Remove scheduled task')
     remove_parser.add_argument('name', help='Task name')
@@ -216,6 +341,14 @@ def execute(args: List[str]) -> int:
 
     parser.add_argument('-h', '--help', action='store_true', dest='show_help')
 
+    _PARSER = parser
+    return parser
+
+
+def execute(args: List[str]) -> int:
+    """Execute the task command."""
+    parser = _get_parser()
+
     # --- Parse arguments safely ---
     ns = parser.parse_args(args)
 
@@ -237,15 +370,9 @@ def execute(args: List[str]) -> int:
         return 0
 
     if ns.mode == 'schedule':
-        if ns.action == 'add':
-            tag = getattr(ns, 'tag', 'user')
-            return 0 if _schedule_task(ns.name, ns.command, ns.schedule, tag) else 1
-        elif ns.action == 'list':
-            return 0 if _list_tasks() else 1
-        elif ns.action == 'remove':
-            return 0 if _remove_task(ns.name) else 1
-        elif ns.action == 'run':
-            return 0 if _run_task(ns.name) else 1
+        action = _ACTIONS.get(ns.action)
+        if action is not None:
+            return 0 if action(ns) else 1
 
     return 1
 
@@ -5,28 +5,46 @@ from __future__ import annotations
 
 import os
 import time
-import argparse
 import sys
 from typing import List
 
+from utils.helpers import parse_flags
+
+
+_FLAGS = {'-h': 'show_help', '--help': 'show_help'}
+
+
+def _parser():
+    import argparse
 
-def execute(args: List[str]) -> int:
     parser = argparse.ArgumentParser(prog='touch', add_help=False)
     parser.add_argument('paths', nargs='+')
     parser.add_argument('-h', '--help', action='store_true', dest='show_help')
+    return parser
+
 
-    ns = parser.parse_args(args)
+def execute(args: List[str]) -> int:
+    ns = parse_flags(args, _FLAGS, 'paths', _parser)
     if ns.show_help:
-        parser.print_help()
+        _parser().print_help()
         return 0
 
+    if not ns.paths:
+        print('touch: missing operand', file=sys.stderr)
+        return 2
+
+    # one timestamp for the whole batch, like GNU touch
+    now = time.time()
+    times = (now, now)
     rc = 0
     for p in ns.paths:
         try:
-            now = time.time()
-            if not os.path.exists(p):
-                open(p, 'a').close()
-            os.utime(p, (now, now))
+            try:
+                # existing files (the common case) cost a single syscall
+                os.utime(p, times)
+            except FileNotFoundError:
+                open(p, 'ab').close()
+                os.utime(p, times)
         except Exception as e:
             print(f"touch: cannot touch '{p}': {e}", file=sys.stderr)
             rc = 1
@@ -8,25 +8,17 @@ project-level `shell.repl`).
 """
 from __future__ import annotations
 
-import argparse
 import importlib
 import sys
 from typing import List
 
+from utils.helpers import get_command_module
 from utils.helpers import list_core_commands as _list_commands
 
 
 def _run_subcommand(cmd: str, args: List[str]) -> int:
-    # cache imported command modules to avoid reloading on repeated calls
-    if not hasattr(_run_subcommand, '_module_cache'):
-        _run_subcommand._module_cache = {}
-    cache = _run_subcommand._module_cache
-
     try:
-        module = cache.get(cmd)
-        if module is None:
-            module = importlib.import_module(f'core.{cmd}')
-            cache[cmd] = module
+        module = get_command_module(cmd)
     except ModuleNotFoundError:
         print(f"wilx: {cmd}: command not found", file=sys.stderr)
         return 127
@@ -48,16 +40,26 @@ def _run_subcommand(cmd: str, args: List[str]) -> int:
         return 1
 
 
-def main(argv: List[str] | None = None) -> int:
-    argv = list(argv or sys.argv[1:])
+def _parser():
+    # only built when argv starts with a global flag; `wilx <cmd> ...`
+    # is dispatched without it
+    import argparse
+
     parser = argparse.ArgumentParser(prog='wilx', add_help=False)
     parser.add_argument('--version', action='store_true', help='print version')
     parser.add_argument('--list-commands', action='store_true', help='list available commands in core/')
     parser.add_argument('--config', help='path to config file (optional)')
     parser.add_argument('cmd', nargs='?', help='command to run (falls back to interactive shell)')
     parser.add_argument('args', nargs=argparse.REMAINDER, help='arguments for the command')
+    return parser
+
+
+def main(argv: List[str] | None = None) -> int:
+    argv = list(argv or sys.argv[1:])
+    if argv and argv[0][:1] != '-':
+        return _run_subcommand(argv[0], argv[1:])
 
-    ns = parser.parse_args(argv)
+    ns = _parser().parse_args(argv)
 
     if ns.version:
         # simple version source: package __version__ if present or fallback
@@ -16,11 +16,11 @@ from __future__ import annotations
 
 import importlib
 import io
-import contextlib
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
 
 ROOT = Path(__file__).resolve().parents[1]
 CORE_DIR = ROOT / 'core'
@@ -35,9 +35,10 @@ if str(ROOT) not in sys.path:
 def list_core_modules() -> List[str]:
     out: List[str] = []
     try:
-        for p in CORE_DIR.iterdir():
-            if p.is_file() and p.suffix == '.py' and not p.name.startswith('_') and p.name != '__init__.py':
-                out.append(p.stem)
+        with os.scandir(CORE_DIR) as it:
+            out = [e.name[:-3] for e in it
+                   if e.name.endswith('.py') and not e.name.startswith('_')
+                   and e.is_file()]
     except Exception:
         pass
     out.sort()
@@ -45,26 +46,31 @@ def list_core_modules() -> List[str]:
 
 
 def capture_help(module) -> str:
-    buf = io.StringIO()
+    old, sys.stdout = sys.stdout, io.StringIO()
     try:
-        with contextlib.redirect_stdout(buf):
-            try:
-                # Many modules accept ['-h'] or ['--help'] — use ['--help'] as convention
-                module.execute(['--help'])
-            except SystemExit:
-                # argparse may call sys.exit after printing help
-                pass
-            except TypeError:
-                # Some modules may not accept execute(args) signature; ignore
-                pass
-            except Exception:
-                # If help invocation fails, ignore and return partial output
-                pass
-    except Exception:
-        return ''
+        # Many modules accept ['-h'] or ['--help'] — use ['--help'] as convention
+        module.execute(['--help'])
+    except (SystemExit, Exception):
+        # argparse may sys.exit after printing help, some modules don't take
+        # execute(args) and others fail; whatever was printed is kept
+        pass
+    finally:
+        buf, sys.stdout = sys.stdout, old
     return buf.getvalue()
 
 
+def _render_one(name: str) -> Tuple[str, str, str, Optional[str]]:
+    """Import one command module and return (name, doc, help, import error).
+
+    Runs in a worker process; the files are written by the parent.
+    """
+    try:
+        mod = importlib.import_module(f'core.{name}')
+    except Exception as e:
+        return name, f'(error importing module: {e})', '', str(e)
+    return name, (mod.__doc__ or '').strip(), capture_help(mod), None
+
+
 def generate():
     OUT_DIR.mkdir(parents=True, exist_ok=True)
     modules = list_core_modules()
@@ -72,34 +78,30 @@ def generate():
         print('No core modules found under core/.')
         return 1
 
-    for name in modules:
-        try:
-            mod = importlib.import_module(f'core.{name}')
-        except Exception as e:
-            print(f'Failed to import core.{name}: {e}')
-            doc = f'(error importing module: {e})'
-            help_text = ''
+    # modules are independent, so import them and capture help in parallel
+    workers = min(len(modules), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        results = list(ex.map(_render_one, modules))
+
+    for name, doc, help_text, err in results:
+        if err is not None:
+            print(f'Failed to import core.{name}: {err}')
+
+        parts = [f'# {name}\n\n']
+        if doc:
+            parts += ['## Description\n\n', doc, '\n\n']
+        else:
+            parts.append('*(no module docstring available)*\n\n')
+
+        parts.append('## Help\n\n')
+        if help_text:
+            parts += ['```\n', help_text.rstrip(), '\n```\n']
         else:
-            doc = (mod.__doc__ or '').strip()
-            help_text = capture_help(mod)
+            parts.append('*(no help output captured)*\n')
 
         md_path = OUT_DIR / f'{name}.md'
         try:
-            with md_path.open('w', encoding='utf-8') as f:
-                f.write(f'# {name}\n\n')
-                if doc:
-                    f.write('## Description\n\n')
-                    f.write(doc + '\n\n')
-                else:
-                    f.write('*(no module docstring available)*\n\n')
-
-                f.write('## Help\n\n')
-                if help_text:
-                    f.write("```\n")
-                    f.write(help_text.rstrip() + '\n')
-                    f.write("```\n")
-                else:
-                    f.write('*(no help output captured)*\n')
+            md_path.write_text(''.join(parts), encoding='utf-8')
         except Exception as e:
             print(f'Failed to write {md_path}: {e}')
             continue
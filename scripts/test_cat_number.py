@@ -0,0 +1,58 @@
+"""Check that `cat -n` numbers lines the same way in both of its code paths.
+
+Small files are numbered in memory, large ones streamed; this forces each
+path in turn (by moving the size threshold) on content with an embedded
+bare '\r', which must not start a new numbered line.
+
+Usage:
+    python scripts/test_cat_number.py
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DATA = b'a\nb\r\nc\rd\n\ne'
+EXPECTED = (b'     1\ta\n'
+            b'     2\tb\r\n'
+            b'     3\tc\rd\n'
+            b'     4\t\n'
+            b'     5\te')
+
+# run in a child so stdout is a real fd (exercising the writev path too)
+CHILD = '''
+import sys
+sys.path.insert(0, {root!r})
+import core.cat as cat
+cat._NUMBER_INMEMORY_MAX = {limit}
+sys.exit(cat.execute(['-n', {path!r}]))
+'''
+
+
+def run(path: str, limit: int) -> bytes:
+    code = CHILD.format(root=ROOT, limit=limit, path=path)
+    return subprocess.run([sys.executable, '-c', code], capture_output=True, check=True).stdout
+
+
+def main() -> int:
+    fd, path = tempfile.mkstemp()
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(DATA)
+        failed = 0
+        for label, limit in (('in-memory', 1 << 20), ('streaming', -1)):
+            out = run(path, limit)
+            ok = out == EXPECTED
+            failed += not ok
+            print(f'{label}: {"ok" if ok else "FAIL"}')
+            if not ok:
+                print(f'  expected {EXPECTED!r}\n  got      {out!r}')
+        return 1 if failed else 0
+    finally:
+        os.unlink(path)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,44 +4,52 @@ from __future__ import annotations
 
 import os
 import sys
+import atexit
 import shlex
-import importlib
 from typing import List
 
-from utils.helpers import list_core_commands
+from utils.helpers import get_command_module, list_core_commands
+
+try:
+    # line editing and history for input(); pyreadline3 provides it on Windows
+    import readline
+except ImportError:
+    readline = None
+
+# kept apart from ~/.wilx_history, which records files saved by nano
+_HISTORY_FILE = os.path.expanduser('~/.wilx_shell_history')
+_HISTORY_LENGTH = 1000
+
+
+def _strip_quotes(toks: List[str]) -> List[str]:
+    # Normalize tokens: strip matching surrounding quotes if present
+    return [t[1:-1] if len(t) >= 2 and t[0] == t[-1] and t[0] in ('"', "'") else t
+            for t in toks]
 
 
 def parse_command(s: str) -> List[str]:
     """Parse a command line into tokens robustly across platforms.
 
     On Windows backslashes are common in paths and POSIX-style shlex
-    parsing may raise ValueError when it encounters an incomplete escape.
-    We try POSIX mode first, then non-POSIX mode on Windows, then fall back to naive split.
+    parsing would treat them as escapes, so an unquoted line containing
+    one is split in non-POSIX mode directly. Otherwise POSIX mode is
+    tried first, then non-POSIX mode on Windows, then a naive split.
     """
+    has_quote = '"' in s or "'" in s
+    if os.name == 'nt' and '\\' in s and not has_quote:
+        # without quotes non-POSIX mode cannot fail
+        return shlex.split(s, posix=False)
+
     # Try POSIX mode first (most common)
     try:
         toks = shlex.split(s, posix=True)
-        # Normalize tokens: strip matching surrounding quotes if present
-        norm = []
-        for t in toks:
-            if len(t) >= 2 and ((t[0] == t[-1]) and t[0] in ('"', "'")):
-                norm.append(t[1:-1])
-            else:
-                norm.append(t)
-        return norm
+        return _strip_quotes(toks) if has_quote else toks
     except ValueError:
         # On Windows, try non-POSIX mode as fallback
         if os.name == 'nt':
             try:
-                toks = shlex.split(s, posix=False)
                 # Strip quotes that may have been retained
-                norm = []
-                for t in toks:
-                    if len(t) >= 2 and ((t[0] == t[-1]) and t[0] in ('"', "'")):
-                        norm.append(t[1:-1])
-                    else:
-                        norm.append(t)
-                return norm
+                return _strip_quotes(shlex.split(s, posix=False))
             except ValueError:
                 pass
     # Final fallback: naive split
@@ -53,16 +61,8 @@ def run_command(cmd: str, args: List[str]) -> int:
 
     Returns an integer exit code (0 success, non-zero error).
     """
-    # cache imported command modules to avoid reloading on repeated calls
-    if not hasattr(run_command, '_module_cache'):
-        run_command._module_cache = {}
-    cache = run_command._module_cache
-
     try:
-        module = cache.get(cmd)
-        if module is None:
-            module = importlib.import_module(f'core.{cmd}')
-            cache[cmd] = module
+        module = get_command_module(cmd)
     except ModuleNotFoundError:
         print(f"wilx: {cmd}: command not found")
         return 127
@@ -89,6 +89,39 @@ def run_command(cmd: str, args: List[str]) -> int:
         return 1
 
 
+def _save_history() -> None:
+    try:
+        readline.write_history_file(_HISTORY_FILE)
+    except Exception:
+        pass
+
+
+def _init_history() -> None:
+    """Load the shell history and arrange for it to be written back at exit."""
+    if readline is None:
+        return
+    try:
+        readline.read_history_file(_HISTORY_FILE)
+    except Exception:
+        # first run, or unreadable: start with an empty history
+        pass
+    try:
+        readline.set_history_length(_HISTORY_LENGTH)
+    except Exception:
+        pass
+    atexit.register(_save_history)
+
+
+def _read_piped(prompt: str) -> str:
+    """input() for scripted (non-tty) stdin, without the readline layer."""
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line
+
+
 def repl() -> int:
     """Main read-eval-print loop for the mini-shell.
 
@@ -99,12 +132,24 @@ def repl() -> int:
     if project_root not in sys.path:
         sys.path.insert(0, project_root)
 
+    if sys.stdin.isatty():
+        # line editing and history only matter when someone is typing
+        read = input
+        _init_history()
+    else:
+        read = _read_piped
+
     cwd = os.getcwd()
+    # rebuilt only when a command changes the working directory
+    prompt = f"{cwd} $ "
 
     while True:
         try:
             # show a simple prompt with the current working directory
-            line = input(f"{cwd} $ ").strip()
+            line = read(prompt)
+            if not line:
+                continue
+            line = line.strip()
             if not line:
                 continue
 
@@ -135,8 +180,11 @@ def repl() -> int:
 
             # dispatch to command modules
             rc = run_command(cmd, args)
-            # update cwd in prompt in case a command changed it (future)
-            cwd = os.getcwd()
+            # update cwd in prompt in case a command changed it (e.g. cd)
+            new_cwd = os.getcwd()
+            if new_cwd != cwd:
+                cwd = new_cwd
+                prompt = f"{cwd} $ "
             # we don't exit the shell on non-zero rc; commands control that
 
         except KeyboardInterrupt:
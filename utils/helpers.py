@@ -6,8 +6,66 @@ portable so command modules can use it without pulling heavy deps.
 
 from __future__ import annotations
 
+import importlib
 import os
-from typing import List
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Callable, Dict, List
+
+if TYPE_CHECKING:
+    import argparse
+
+
+_fadvise = getattr(os, 'posix_fadvise', None)
+
+# files at least this large are dropped from the page cache after a
+# one-shot read; smaller ones are cheap to keep and likely to be reread
+_DROP_CACHE_MIN = 64 << 20
+
+
+def advise_sequential(fd: int) -> None:
+    """Hint that `fd` will be read once front to back and start read-ahead.
+
+    No-op where posix_fadvise is unavailable (Windows, macOS).
+    """
+    if _fadvise is None:
+        return
+    try:
+        _fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        _fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+
+
+def advise_done(fd: int, size: int | None = None) -> None:
+    """Let the kernel drop the cached pages of a large file that was read once."""
+    if _fadvise is None:
+        return
+    try:
+        if size is None:
+            size = os.fstat(fd).st_size
+        if size >= _DROP_CACHE_MIN:
+            _fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    except OSError:
+        pass
+
+
+# buffers handed to one os.writev() call (the usual IOV_MAX)
+IOV_MAX = 1024
+
+
+def writev_all(fd: int, iov: List[bytes]) -> None:
+    """os.writev() the buffers in `iov` to `fd`, finishing any short write."""
+    for i in range(0, len(iov), IOV_MAX):
+        chunk = iov[i:i + IOV_MAX]
+        n = os.writev(fd, chunk)
+        if n < sum(map(len, chunk)):
+            rest = memoryview(b"".join(chunk))[n:]
+            while rest:
+                rest = rest[os.write(fd, rest):]
+
+
+# characters os.path.basename splits on (ntpath also strips a drive)
+_NAME_SEPS = '/\\:' if os.name == 'nt' else '/'
 
 
 def is_hidden(name: str) -> bool:
@@ -18,27 +76,98 @@ def is_hidden(name: str) -> bool:
     intentionally minimal; developers may add platform-specific checks
     later if needed.
     """
-    return os.path.basename(name).startswith('.')
+    # bare entry names from a directory listing skip basename()
+    for sep in _NAME_SEPS:
+        if sep in name:
+            name = os.path.basename(name)
+            break
+    return name[:1] == '.'
+
+
+_CORE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'core')
+# last scan of core/, reused while the directory's mtime is unchanged
+_CMDS_CACHE = {'mtime': -1, 'cmds': []}
 
 
 def list_core_commands() -> List[str]:
     """Return a sorted list of available command module names in `core/`.
 
     This scans the `core` package directory for .py files (ignoring
-    __init__.py and private files starting with underscore).
+    __init__.py and private files starting with underscore). The result
+    is cached until a file is added to or removed from `core/`; callers
+    must not modify the returned list.
     """
-    # Get the core directory relative to this file
-    utils_dir = os.path.dirname(__file__)
-    core_dir = os.path.join(os.path.dirname(utils_dir), 'core')
-    cmds = []
     try:
-        for fname in os.listdir(core_dir):
-            if not fname.endswith('.py'):
-                continue
-            if fname == '__init__.py' or fname.startswith('_'):
-                continue
-            cmds.append(os.path.splitext(fname)[0])
+        mtime = os.stat(_CORE_DIR).st_mtime_ns
+        if mtime == _CMDS_CACHE['mtime']:
+            return _CMDS_CACHE['cmds']
+        # '_' also covers __init__.py; scandir's is_file needs no extra stat
+        with os.scandir(_CORE_DIR) as it:
+            cmds = [e.name[:-3] for e in it
+                    if e.name.endswith('.py') and not e.name.startswith('_')
+                    and e.is_file()]
     except Exception:
         # If the package isn't present or readable, return empty list.
         return []
-    return sorted(cmds)
+    cmds.sort()
+    _CMDS_CACHE['mtime'] = mtime
+    _CMDS_CACHE['cmds'] = cmds
+    return cmds
+
+
+# command modules already imported, shared by main.py and the shell
+_MOD_CACHE: Dict[str, object] = {}
+
+
+def get_command_module(name: str):
+    """Return the imported `core.<name>` module, importing it on first use.
+
+    Import errors (ModuleNotFoundError for unknown commands) propagate to
+    the caller, and a failed import is not cached.
+    """
+    mod = _MOD_CACHE.get(name)
+    if mod is None:
+        mod = _MOD_CACHE[name] = importlib.import_module(f'core.{name}')
+    return mod
+
+
+def parse_flags(args: List[str], flags: Dict[str, str], positional: str,
+                fallback: Callable[[], 'argparse.ArgumentParser']):
+    """Parse boolean flags and positionals without building an argparse parser.
+
+    `flags` maps every accepted spelling (e.g. '-n' and '--number') to the
+    attribute name argparse would use. Returns a namespace with one bool per
+    flag name plus the remaining arguments under `positional`. Bundled short
+    flags ('-rf') are supported and '--' ends option parsing.
+
+    Anything else starting with '-' (abbreviated long options, unknown
+    options) is handed to the parser built by `fallback()` so behaviour and
+    error messages stay exactly those of argparse. Commands using this keep
+    `import argparse` inside their `fallback` (conventionally `_parser()`),
+    so the module is only imported and a parser only built for --help and
+    for arguments this fast path doesn't handle.
+    """
+    values = dict.fromkeys(flags.values(), False)
+    positionals: List[str] = []
+    it = iter(args)
+    for a in it:
+        if a == '--':
+            positionals.extend(it)
+            break
+        if len(a) < 2 or a[0] != '-':
+            positionals.append(a)
+            continue
+        name = flags.get(a)
+        if name is not None:
+            values[name] = True
+            continue
+        if a[1] == '-':
+            return fallback().parse_args(args)
+        # bundled short flags: every letter must be known
+        for ch in a[1:]:
+            name = flags.get('-' + ch)
+            if name is None:
+                return fallback().parse_args(args)
+            values[name] = True
+    values[positional] = positionals
+    return SimpleNamespace(**values)